@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import video, automation_vedai, scribe_vedai, triaging
-
-app = FastAPI(title="Scribe Test Generator")
+from app.utils.disk_gc import disk_gc
+from app.utils.llm_client import llm_pool
+
+@asynccontextmanager
+async def lifespan(app):
+    # Keep uploads, frames and job workspaces within their disk budgets
+    disk_gc.start()
+    yield
+    disk_gc.stop()
+    # Close the pooled LLM connections
+    await llm_pool.close()
+
+app = FastAPI(title="Scribe Test Generator", lifespan=lifespan)
 
 # Add CORS middleware configuration
 origins = [
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Header
 from fastapi.responses import JSONResponse
 from app.utils.vedai_helper import VedAIHelper
+from app.utils.script_templates import FRAMEWORK_ALIASES, generate_script, parse_script_steps
 from typing import Optional
 import logging
 
@@ -49,6 +50,18 @@ async def generate_script_vedai(request: dict, x_api_key: Optional[str] = Header
         if not all([test_case, framework]):
             raise HTTPException(status_code=400, detail="Test case and framework are required")
         
+        # Recordings every step of which has a template need no VedAI round trip
+        if request.get('use_templates', True) and framework.strip().lower() in FRAMEWORK_ALIASES:
+            scenarios = parse_script_steps(test_case)
+            if scenarios:
+                result = await generate_script(scenarios, framework, log_callback=logger.info)
+                if not result["todo_steps"]:
+                    logger.info(f"Generated {framework} script from templates")
+                    return JSONResponse(
+                        status_code=200,
+                        content={**result, "generator": "template"}
+                    )
+        
         logger.info(f"Generating {framework} script with VedAI")
         helper = VedAIHelper(x_api_key)
         
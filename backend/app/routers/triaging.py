@@ -76,7 +76,7 @@ async def verify_chatgpt(request: dict):
         
         helper = ChatGPTHelper(api_key)
         logger.info(f"Attempting ChatGPT connection...")
-        is_valid = helper.verify_connection()
+        is_valid = await helper.verify_connection()
         logger.info(f"ChatGPT connection result: {is_valid}")
         
         return JSONResponse(
@@ -132,7 +132,7 @@ async def analyze_issue(request: dict):
         
         # Get AI analysis
         chatgpt_helper = ChatGPTHelper(api_key)
-        analysis = chatgpt_helper.generate_response([{
+        analysis = await chatgpt_helper.generate_response([{
             "role": "system",
             "content": "You are a helpful assistant analyzing software issues."
         }, {
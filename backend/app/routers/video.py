@@ -1,16 +1,32 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Form
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.utils.video_processor import extract_frames, extract_text_from_frames
-from app.utils.pdf_processor import extract_text_from_pdf, process_test_cases, generate_test_cases
+from starlette.concurrency import run_in_threadpool
+from app.utils.video_processor import (
+    extract_frames, extract_text_from_frames, process_video, check_sampling_mode, check_sampling_options,
+    check_ocr_profile, OCRPreprocessor, DEFAULT_SAMPLING_MODE, DEFAULT_MIN_SCENE_GAP, DEFAULT_OCR_PROFILE
+)
+from app.utils.ocr_cache import OCR_CACHE_DIR, get_ocr_cache
+from app.utils.ocr_engine import check_ocr_workers
+from app.utils.pdf_processor import iter_pdf_pages
+from app.utils.pdf_engines import get_pdf_engine
+from app.utils.pdf_images import extract_screenshots_zip
+from app.utils.text_dedup import TEXT_DEDUP_ENABLED, dedup_text
+from app.utils.script_templates import FRAMEWORK_ALIASES, generate_script, parse_script_steps
 from app.utils.test_case_generator import generate_test_cases
 import os
 import shutil
 import zipfile
 import io
-from typing import List
+from typing import List, Optional
 from app.utils.chatgpt_helper import ChatGPTHelper
 from app.utils.jira_helper import JiraHelper
+from app.utils.job_manager import job_manager
+from app.utils.content_store import CONTENT_STORE_FOLDER, content_store, save_upload_hashed, variant_key
+from app.utils.workspace import WORKSPACES_FOLDER, touch_workspace, workspace_path
+from app.utils.disk_gc import disk_gc
+from app.utils.sprites import DEFAULT_SPRITE_TILE_WIDTH, SPRITE_FORMAT, get_sprite_sheets
+from app.utils.thumbnails import THUMBNAIL_CACHE_DIR, DEFAULT_THUMBNAIL_FORMAT, file_validators, get_thumbnail, is_not_modified
 import json
 from datetime import datetime
 import logging
@@ -52,97 +68,376 @@ for folder in [UPLOAD_FOLDER, FRAMES_FOLDER, PDF_FOLDER, TEST_CASES_FOLDER, AUTO
     os.makedirs(folder, exist_ok=True)
     print(f"Ensuring directory exists: {os.path.abspath(folder)}")
 
+# Disk GC: uploads, frames, thumbnails and stored results can be recreated and
+# may be evicted. Saved scripts and test cases are user data and the OCR cache
+# manages itself, so those only count towards the usage figures.
+disk_gc.register_area("uploaded_videos", UPLOAD_FOLDER)
+disk_gc.register_area("uploaded_pdfs", PDF_FOLDER)
+disk_gc.register_area("frames", FRAMES_FOLDER)
+disk_gc.register_area("thumbnails", THUMBNAIL_CACHE_DIR, sharded=True)
+disk_gc.register_area("automation_scripts", AUTOMATION_SCRIPTS_FOLDER, evictable=False)
+disk_gc.register_area("saved_test_cases", TEST_CASES_FOLDER, evictable=False)
+disk_gc.register_area("ocr_cache", OCR_CACHE_DIR, evictable=False)
+disk_gc.register_area("content_store", CONTENT_STORE_FOLDER, sharded=True)
+
+# Stored PDF text; renamed when extraction changes so older results aren't reused
+PDF_TEXT_VARIANT = "pdf-text-pages"
+SCREENSHOTS_VARIANT = "pdf-screenshots"
+
+def _iter_pdf_text_cached(digest, file_path, force_refresh, log, pdf_engine=None, progress_callback=None):
+    """Yield the text of each non-empty PDF page as soon as it is extracted.
+
+    Reuses the stored result if this content was seen before; a new result is
+    stored once every page has been read.
+    """
+    pdf_engine = get_pdf_engine(pdf_engine).name
+    variant = f"{PDF_TEXT_VARIANT}-{pdf_engine}"
+    if not force_refresh:
+        cached = content_store.load(digest, variant)
+        if cached is not None:
+            log(f"Reusing extracted text from an earlier upload of the same PDF ({digest[:12]})")
+            yield from cached["text_data"]
+            return
+    text_data = []
+    for pages_processed, (_, text) in enumerate(iter_pdf_pages(file_path, log_callback=log, engine=pdf_engine), 1):
+        if progress_callback:
+            progress_callback(pages_processed=pages_processed)
+        text = text.strip()
+        if text:
+            text_data.append(text)
+            yield text
+    if text_data:
+        content_store.save(digest, variant, {"text_data": text_data})
+
+def _extract_pdf_text_cached(digest, file_path, force_refresh, log, pdf_engine=None, progress_callback=None):
+    """Extract the text of a PDF, one block per page, reusing the stored result if this content was seen before"""
+    return list(_iter_pdf_text_cached(digest, file_path, force_refresh, log, pdf_engine, progress_callback))
+
+def _prompt_text(text_data, log):
+    """Join extracted pages for an LLM prompt, leaving out headers, footers and OCR noise repeated on nearby pages"""
+    if not TEXT_DEDUP_ENABLED:
+        return "\n".join(text_data)
+    text_data, _ = dedup_text(text_data, log_callback=log)
+    return "\n".join(text_data)
+
+def _count_lines(text_data):
+    return sum(len(block.splitlines()) for block in text_data)
+
+def _process_upload(job, filename, digest, file_path, is_pdf, save_frames, video_options, force_refresh,
+                    pdf_engine=None):
+    """Extract text from an uploaded video or PDF and parse it into test cases (runs as a job)"""
+    log = job.log
+    log(f"Received file: {filename}")
+
+    if is_pdf:
+        # Pages go to the parser as they are extracted, so scenarios are parsed
+        # while later pages are still being rendered and OCR'd
+        text_data = []
+        lines_parsed = 0
+
+        def pages():
+            nonlocal lines_parsed
+            for text in _iter_pdf_text_cached(digest, file_path, force_refresh, log, pdf_engine,
+                                              job.update_progress):
+                text_data.append(text)
+                yield text
+                lines_parsed += len(text.splitlines())
+                job.update_progress(lines_parsed=lines_parsed)
+
+        test_cases = generate_test_cases(pages())
+        log(f"PDF text extraction result: {len(text_data)} pages, {lines_parsed} lines")
+        if not text_data:
+            raise Exception("No text could be extracted from the PDF")
+
+        # Return response without frames for PDF
+        return {
+            "test_cases": test_cases,
+            "is_video": False
+        }
+
+    # Frames and OCR text depend on the processing options (not on the worker count)
+    variant = variant_key("video", {
+        **{name: value for name, value in video_options.items() if name != "workers"},
+        "save_frames": save_frames
+    })
+    if not force_refresh:
+        cached = content_store.load(digest, variant)
+        if cached is not None and all(os.path.exists(frame_file) for frame_file in cached["frames"]):
+            log(f"Reusing frames, text and test cases from an earlier upload of the same video ({digest[:12]})")
+            # The frames stay in the workspace of the job that produced them
+            workspace = cached.pop("workspace", None)
+            if workspace:
+                touch_workspace(workspace)
+            job.update_progress(frames_decoded=cached["debug_info"]["frame_count"],
+                                frames_ocrd=cached["debug_info"]["frame_count"],
+                                lines_parsed=cached.pop("lines_parsed", 0))
+            return cached
+
+    # Process video: decoded frames go straight to OCR, the JPEGs for
+    # the UI are written on the side into this job's own workspace
+    frames_path = os.path.join(job.workspace, "frames") if save_frames else None
+    text_data, frame_files = process_video(
+        file_path, frames_path, log_callback=log, progress_callback=job.update_progress, **video_options
+    )
+    log(f"Video text extraction result: {len(text_data)} lines")
+    if not text_data:
+        # Nothing to show for this job, so its frames are not kept
+        if frames_path:
+            shutil.rmtree(frames_path, ignore_errors=True)
+        raise Exception("No text could be extracted from the video")
+
+    frame_files = [frame_file.replace('\\', '/') for frame_file in frame_files]
+
+    # Consecutive frames repeat most of their text
+    dedup_report = None
+    if TEXT_DEDUP_ENABLED:
+        text_data, dedup_report = dedup_text(text_data, log_callback=log)
+
+    # Generate test cases
+    test_cases = generate_test_cases(text_data)
+    lines_parsed = _count_lines(text_data)
+    job.update_progress(lines_parsed=lines_parsed)
+
+    # Return response with frames for video
+    result = {
+        "test_cases": test_cases,
+        "frames": frame_files,
+        "is_video": True,
+        "debug_info": {
+            "frames_path": frames_path,
+            "frame_count": len(frame_files),
+            "sample_path": frame_files[0] if frame_files else None,
+            "text_dedup": dedup_report
+        }
+    }
+    content_store.save(digest, variant, {**result, "lines_parsed": lines_parsed, "workspace": job.workspace})
+    return result
+
 @router.post("/upload")
-async def upload_video(file: UploadFile = File(...)):
-    logs = []
-    def log(message):
-        print(message)
-        logs.append(message)
+async def upload_video(
+    file: UploadFile = File(...),
+    frame_rate: float = Form(1.0),
+    frame_interval: Optional[float] = Form(None),
+    start_time: Optional[float] = Form(None),
+    end_time: Optional[float] = Form(None),
+    sampling_mode: str = Form(DEFAULT_SAMPLING_MODE),
+    scene_threshold: Optional[float] = Form(None),
+    min_scene_gap: float = Form(DEFAULT_MIN_SCENE_GAP),
+    max_scene_gap: Optional[float] = Form(None),
+    ocr_workers: Optional[int] = Form(None),
+    ocr_profile: str = Form(DEFAULT_OCR_PROFILE),
+    ocr_max_width: Optional[int] = Form(None),
+    ocr_grayscale: bool = Form(True),
+    ocr_binarize: bool = Form(False),
+    pdf_engine: Optional[str] = Form(None),
+    save_frames: bool = Form(True),
+    background: bool = Form(False),
+    force_refresh: bool = Form(False)
+):
+    """Process an uploaded video or Scribe PDF as a background job.
+
+    With background=true the job id is returned immediately and progress is
+    available from /jobs/{job_id} (polling) or /jobs/{job_id}/events (SSE).
+    Otherwise the request waits for the job, off the event loop, and returns
+    the full result as before. Content uploaded before is not reprocessed
+    unless force_refresh=true.
+
+    Videos are sampled at frame_rate frames per second, or one frame every
+    frame_interval seconds, between start_time and end_time (seconds).
+    Before OCR, frames are shrunk to ocr_max_width pixels and converted to
+    grayscale (ocr_grayscale) or black and white (ocr_binarize). PDFs are
+    read with pdf_engine (pymupdf, pdfplumber or pypdf2; PDF_ENGINE by default).
+    """
+    if frame_interval is not None:
+        if frame_interval <= 0:
+            raise HTTPException(status_code=400, detail="frame_interval must be positive")
+        frame_rate = 1.0 / frame_interval
+    try:
+        check_sampling_mode(sampling_mode)
+        check_sampling_options(frame_rate, start_time, end_time)
+        check_ocr_workers(ocr_workers)
+        check_ocr_profile(ocr_profile)
+        OCRPreprocessor(ocr_max_width, ocr_grayscale, ocr_binarize)
+        if pdf_engine:
+            get_pdf_engine(pdf_engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        log(f"Received file: {file.filename}")
-        
         # Determine file type
         file_extension = os.path.splitext(file.filename)[1].lower()
-        
-        # Process based on file type
-        if file_extension == '.pdf':
-            file_path = os.path.join(PDF_FOLDER, file.filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Extract text from PDF
-            text_data = extract_text_from_pdf(file_path)
-            log(f"PDF text extraction result: {len(text_data)} lines")
-            if not text_data:
-                raise Exception("No text could be extracted from the PDF")
-            
-            # Generate test cases
-            test_cases = await process_test_cases(text_data)
-            
-            # Return response without frames for PDF
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "test_cases": test_cases,
-                    "logs": logs,
-                    "is_video": False
-                }
-            )
-        else:
-            # Handle video file
-            file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Process video
-            frames_path = os.path.join(FRAMES_FOLDER, os.path.splitext(file.filename)[0])
-            num_frames = extract_frames(file_path, frames_path, log_callback=log)
-            text_data = extract_text_from_frames(frames_path, log_callback=log)
-            log(f"Video text extraction result: {len(text_data)} lines")
-            if not text_data:
-                raise Exception("No text could be extracted from the video")
-            
-            # Get list of frame paths
-            frame_files = []
-            if os.path.exists(frames_path):
-                frame_files = [f for f in os.listdir(frames_path) if f.endswith('.jpg')]
-                frame_files.sort(key=lambda x: int(x.split('_')[1].split('.')[0]))
-                frame_files = [os.path.join(os.path.basename(FRAMES_FOLDER), 
-                                  os.path.basename(frames_path), 
-                                  f).replace('\\', '/') for f in frame_files]
-            
-            # Generate test cases
-            test_cases = await process_test_cases(text_data)
-            
-            # Return response with frames for video
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "test_cases": test_cases,
-                    "logs": logs,
-                    "frames": frame_files,
-                    "is_video": True,
-                    "debug_info": {
-                        "frames_path": frames_path,
-                        "frame_count": len(frame_files),
-                        "sample_path": frame_files[0] if frame_files else None
-                    }
-                }
-            )
-        
+        is_pdf = file_extension == '.pdf'
+        digest, file_path = await run_in_threadpool(
+            save_upload_hashed, file, PDF_FOLDER if is_pdf else UPLOAD_FOLDER
+        )
     except Exception as e:
-        log(f"Error processing file: {str(e)}")
-        import traceback
-        log(traceback.format_exc())
+        print(f"Error saving upload: {str(e)}")
         return JSONResponse(
             status_code=500,
-            content={"error": str(e), "logs": logs}
+            content={"error": str(e), "logs": [f"Error processing file: {str(e)}"]}
+        )
+
+    video_options = {
+        "frame_rate": frame_rate,
+        "start_time": start_time,
+        "end_time": end_time,
+        "sampling_mode": sampling_mode,
+        "scene_threshold": scene_threshold,
+        "min_scene_gap": min_scene_gap,
+        "max_scene_gap": max_scene_gap,
+        "workers": ocr_workers,
+        "ocr_profile": ocr_profile,
+        "ocr_max_width": ocr_max_width,
+        "ocr_grayscale": ocr_grayscale,
+        "ocr_binarize": ocr_binarize
+    }
+    job = job_manager.submit(
+        "upload", _process_upload, file.filename, digest, file_path, is_pdf, save_frames, video_options, force_refresh,
+        pdf_engine, with_workspace=True
+    )
+
+    if background:
+        return JSONResponse(
+            status_code=202,
+            content={
+                "job_id": job.id,
+                "status_url": f"{router.prefix}/jobs/{job.id}",
+                "events_url": f"{router.prefix}/jobs/{job.id}/events",
+                "sprites_url": f"{router.prefix}/jobs/{job.id}/sprites"
+            }
+        )
+
+    await job_manager.wait(job)
+    if job.status == "failed":
+        return JSONResponse(
+            status_code=500,
+            content={"error": job.error, "logs": job.logs}
         )
+    content = {**job.result, "logs": job.logs}
+    if job.result.get("frames"):
+        content["sprites_url"] = f"{router.prefix}/jobs/{job.id}/sprites"
+    return JSONResponse(
+        status_code=200,
+        content=content
+    )
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, logs_since: int = 0):
+    """Poll a background job for status, progress counters, new log lines and its result"""
+    state = job_manager.get_state(job_id, logs_since=logs_since)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(status_code=200, content=state)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Stream a background job's progress and log lines as Server-Sent Events"""
+    if job_manager.get_state(job_id, include_result=False) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        job_manager.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/jobs/{job_id}/sprites")
+async def get_job_sprites(job_id: str, tile_width: int = DEFAULT_SPRITE_TILE_WIDTH):
+    """Index of sprite sheets packing all frames of a finished job, built once and cached.
+
+    Each entry of "frames" gives the sheet and tile rectangle of one frame, in
+    the same order as the job's frame list.
+    """
+    state = job_manager.get_state(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if state["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {state['status']}")
+    frames = state["result"].get("frames") or []
+    if not frames:
+        raise HTTPException(status_code=404, detail="Job has no frames")
+
+    folder = os.path.join(workspace_path(job_id), "sprites", str(tile_width))
+    try:
+        index = await run_in_threadpool(get_sprite_sheets, frames, folder, tile_width)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sheet_urls = [f"{router.prefix}/jobs/{job_id}/sprites/{tile_width}/{sheet['file']}" for sheet in index["sheets"]]
+    return JSONResponse(
+        status_code=200,
+        content={**index, "sheets": [{**sheet, "url": url} for sheet, url in zip(index["sheets"], sheet_urls)]},
+        headers={"Cache-Control": FRAME_CACHE_CONTROL}
+    )
+
+@router.get("/jobs/{job_id}/sprites/{tile_width}/{sheet_name}")
+async def get_job_sprite_sheet(job_id: str, tile_width: int, sheet_name: str, request: Request):
+    """Serve one sprite sheet of a job with ETag and Last-Modified"""
+    path = os.path.join(workspace_path(job_id), "sprites", str(tile_width), os.path.basename(sheet_name))
+    if not sheet_name.endswith(f".{SPRITE_FORMAT}") or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Sprite sheet not found")
+    etag, last_modified = file_validators(path)
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": FRAME_CACHE_CONTROL}
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=f"image/{SPRITE_FORMAT}", headers=headers)
+
+@router.get("/storage/usage")
+async def get_storage_usage():
+    """Disk usage of the upload, frame and workspace folders and the result of the last GC run"""
+    return JSONResponse(status_code=200, content=await run_in_threadpool(disk_gc.usage))
+
+@router.post("/storage/gc")
+async def run_storage_gc():
+    """Run disk garbage collection now instead of waiting for the next interval"""
+    return JSONResponse(status_code=200, content=await run_in_threadpool(disk_gc.run_once))
+
+@router.get("/ocr-cache/stats")
+async def get_ocr_cache_stats():
+    """Hit/miss counters of the shared OCR result cache"""
+    cache = get_ocr_cache()
+    if cache is None:
+        return JSONResponse(status_code=200, content={"enabled": False})
+    return JSONResponse(status_code=200, content=cache.stats())
+
+# Job workspaces are never rewritten, so their frames can be cached for good
+FRAME_CACHE_CONTROL = "public, max-age=31536000, immutable"
+SHARED_FRAME_CACHE_CONTROL = "public, max-age=86400"
+
+def _resolve_frame_path(frame_path):
+    """Absolute path of a frame inside the frame folders, or None for anything else"""
+    path = os.path.realpath(frame_path)
+    for root in (WORKSPACES_FOLDER, FRAMES_FOLDER):
+        root = os.path.realpath(root)
+        if path.startswith(root + os.sep) and os.path.isfile(path):
+            return path, root == os.path.realpath(WORKSPACES_FOLDER)
+    return None, False
 
 @router.get("/frame/{frame_path:path}")
-async def get_frame(frame_path: str):
-    return FileResponse(frame_path)
+async def get_frame(frame_path: str, request: Request, width: Optional[int] = None,
+                    format: str = DEFAULT_THUMBNAIL_FORMAT):
+    """Serve a frame, or with ?width= a resized WebP/JPEG variant, with ETag and Last-Modified"""
+    source, immutable = _resolve_frame_path(frame_path)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Frame not found")
+
+    etag, last_modified = file_validators(source, f"{width}-{format}" if width else "")
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": FRAME_CACHE_CONTROL if immutable else SHARED_FRAME_CACHE_CONTROL
+    }
+    if immutable:
+        # Viewing a job's frames keeps its workspace from being garbage collected
+        touch_workspace(os.path.dirname(os.path.dirname(source)))
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if not width:
+        return FileResponse(source, headers=headers)
+
+    try:
+        path, media_type = await run_in_threadpool(get_thumbnail, source, width, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FileResponse(path, media_type=media_type, headers=headers)
 
 @router.post("/verify-chatgpt")
 async def verify_chatgpt(request: dict):
@@ -153,7 +448,7 @@ async def verify_chatgpt(request: dict):
         
         helper = ChatGPTHelper(api_key)
         print(f"Attempting ChatGPT connection...")
-        is_valid = helper.verify_connection()
+        is_valid = await helper.verify_connection()
         print(f"ChatGPT connection result: {is_valid}")
         return JSONResponse(
             status_code=200,
@@ -214,7 +509,7 @@ async def generate_test_cases_from_story(request: dict):
             raise HTTPException(status_code=400, detail="User story and API key are required")
         
         helper = ChatGPTHelper(api_key)
-        test_cases = helper.generate_test_cases(user_story)
+        test_cases = await helper.generate_test_cases(user_story)
         
         return JSONResponse(
             status_code=200,
@@ -292,6 +587,27 @@ async def download_test_case(filename: str):
         print(f"Error downloading test case: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _template_script(request: dict, framework: str):
+    """Script for the request's test case from templates, or None to use the LLM for the whole script.
+
+    Only steps no template covers go to the LLM. Send use_templates=false to
+    skip the templates.
+    """
+    test_case = request.get('test_case')
+    api_key = request.get('api_key')
+    if not request.get('use_templates', True) or framework.strip().lower() not in FRAMEWORK_ALIASES:
+        return None
+    scenarios = parse_script_steps(test_case)
+    if not scenarios:
+        return None
+    result = await generate_script(scenarios, framework)
+    if not result["template_steps"]:
+        # Free-form test cases: the LLM writes a better script in one go
+        return None
+    if result["todo_steps"] and api_key:
+        result = await generate_script(scenarios, framework, llm=ChatGPTHelper(api_key).generate_automation_script)
+    return {**result, "generator": "template+llm" if result["llm_steps"] else "template"}
+
 @router.post("/generate-automation-script")
 async def generate_automation_script(request: dict):
     try:
@@ -299,7 +615,14 @@ async def generate_automation_script(request: dict):
         framework = request.get('framework')
         api_key = request.get('api_key')
         
-        if not all([test_case, framework, api_key]):
+        if not all([test_case, framework]):
+            raise HTTPException(status_code=400, detail="Test case and framework are required")
+        
+        result = await _template_script(request, framework)
+        if result is not None:
+            return JSONResponse(status_code=200, content=result)
+        
+        if not api_key:
             raise HTTPException(status_code=400, detail="Test case, framework and API key are required")
         
         helper = ChatGPTHelper(api_key)
@@ -320,7 +643,7 @@ async def generate_automation_script(request: dict):
         Generate only the {framework} script without any additional explanations.
         """
         
-        generated_script = helper.generate_automation_script(prompt)
+        generated_script = await helper.generate_automation_script(prompt)
         
         return JSONResponse(
             status_code=200,
@@ -355,7 +678,7 @@ async def improve_gherkin(request: dict):
         Return only the improved Gherkin script without any additional explanations.
         """
         
-        improved_script = helper.generate_automation_script(prompt)
+        improved_script = await helper.generate_automation_script(prompt)
         
         return JSONResponse(
             status_code=200,
@@ -402,7 +725,7 @@ async def analyze_test_case(request: dict):
         Ensure the response maintains this exact formatting with the sections clearly separated.
         """
         
-        analysis = helper.generate_automation_script(prompt)
+        analysis = await helper.generate_automation_script(prompt)
         
         return JSONResponse(
             status_code=200,
@@ -418,7 +741,14 @@ async def generate_sahi_script(request: dict):
         test_case = request.get('test_case')
         api_key = request.get('api_key')
         
-        if not all([test_case, api_key]):
+        if not test_case:
+            raise HTTPException(status_code=400, detail="Test case is required")
+        
+        result = await _template_script(request, "SAHI Pro")
+        if result is not None:
+            return JSONResponse(status_code=200, content=result)
+        
+        if not api_key:
             raise HTTPException(status_code=400, detail="Test case and API key are required")
         
         helper = ChatGPTHelper(api_key)
@@ -439,7 +769,7 @@ async def generate_sahi_script(request: dict):
         Generate only the SAHI script without any additional explanations.
         """
         
-        script = helper.generate_automation_script(prompt)
+        script = await helper.generate_automation_script(prompt)
         
         return JSONResponse(
             status_code=200,
@@ -527,7 +857,14 @@ async def generate_selenium_script(request: dict):
         test_case = request.get('test_case')
         api_key = request.get('api_key')
         
-        if not all([test_case, api_key]):
+        if not test_case:
+            raise HTTPException(status_code=400, detail="Test case is required")
+        
+        result = await _template_script(request, "Selenium")
+        if result is not None:
+            return JSONResponse(status_code=200, content=result)
+        
+        if not api_key:
             raise HTTPException(status_code=400, detail="Test case and API key are required")
         
         helper = ChatGPTHelper(api_key)
@@ -549,7 +886,7 @@ async def generate_selenium_script(request: dict):
         Generate only the Selenium Java script without any additional explanations.
         """
         
-        script = helper.generate_automation_script(prompt)
+        script = await helper.generate_automation_script(prompt)
         
         return JSONResponse(
             status_code=200,
@@ -617,7 +954,7 @@ async def improve_test_cases(request: dict):
         {test_cases}
         """
         
-        improved_test_cases = helper.generate_test_cases(base_prompt)
+        improved_test_cases = await helper.generate_test_cases(base_prompt)
         
         return JSONResponse(
             status_code=200,
@@ -750,7 +1087,7 @@ async def improve_script(request: dict):
         Return the complete test case maintaining exact format and style.
         """
         
-        improved_script = helper.generate_automation_script(prompt)
+        improved_script = await helper.generate_automation_script(prompt)
         
         return JSONResponse(
             status_code=200,
@@ -828,7 +1165,7 @@ async def generate_test_cases_from_text(request: dict):
             raise HTTPException(status_code=400, detail="User story and API key are required")
         
         helper = ChatGPTHelper(api_key)
-        test_cases = helper.generate_test_cases(user_story)
+        test_cases = await helper.generate_test_cases(user_story)
         
         return JSONResponse(
             status_code=200,
@@ -839,7 +1176,7 @@ async def generate_test_cases_from_text(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/process-scribe-with-ai")
-async def process_scribe_with_ai(file: UploadFile = File(...), api_key: str = Form(...)):
+async def process_scribe_with_ai(file: UploadFile = File(...), api_key: str = Form(...), force_refresh: bool = Form(False)):
     logs = []
     def log(message):
         print(message)
@@ -849,21 +1186,25 @@ async def process_scribe_with_ai(file: UploadFile = File(...), api_key: str = Fo
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        # Save uploaded file
-        file_path = os.path.join(PDF_FOLDER, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Extract text from PDF
-        text_data = extract_text_from_pdf(file_path)
-        log(f"PDF text extraction result: {len(text_data)} lines")
-        
-        if not text_data:
-            raise Exception("No text could be extracted from the PDF")
+        # Save uploaded file under its content hash
+        digest, file_path = await run_in_threadpool(save_upload_hashed, file, PDF_FOLDER)
         
-        # Process with AI
-        helper = ChatGPTHelper(api_key)
-        test_cases = helper.generate_test_cases("\n".join(text_data))
+        test_cases = None if force_refresh else (content_store.load(digest, "scribe-ai") or {}).get("test_cases")
+        if test_cases:
+            log(f"Reusing AI test cases from an earlier upload of the same PDF ({digest[:12]})")
+        else:
+            # Extract text from PDF
+            # Rendering and OCR of image-only pages must not hold up the event loop
+            text_data = await run_in_threadpool(_extract_pdf_text_cached, digest, file_path, force_refresh, log)
+            log(f"PDF text extraction result: {len(text_data)} pages, {_count_lines(text_data)} lines")
+            
+            if not text_data:
+                raise Exception("No text could be extracted from the PDF")
+            
+            # Process with AI
+            helper = ChatGPTHelper(api_key)
+            test_cases = await helper.generate_test_cases(_prompt_text(text_data, log))
+            content_store.save(digest, "scribe-ai", {"test_cases": test_cases})
         
         return JSONResponse(
             status_code=200,
@@ -913,7 +1254,7 @@ async def backfill_test_case(request: dict):
             raise HTTPException(status_code=400, detail="Story and API key are required")
         
         helper = ChatGPTHelper(api_key)
-        test_case = helper.generate_test_cases(story['description'])
+        test_case = await helper.generate_test_cases(story['description'])
         
         # Save test case
         filename = f"Test Case{story['key']}.txt"
@@ -1043,59 +1384,68 @@ async def list_scripts():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/extract-screenshots")
-async def extract_screenshots(file: UploadFile = File(...), api_key: str = Form(...)):
-    """Extract embedded images from PDF using pdfplumber"""
+async def extract_screenshots(file: UploadFile = File(...), api_key: str = Form(...), force_refresh: bool = Form(False)):
+    """Extract the embedded screenshots of a PDF into a ZIP and generate test cases from its text"""
     logs = []
     def log(message):
         print(message)
         logs.append(message)
     
-    # Initialize variables that will be used in finally block
-    file_path = None
-    screenshots_dir = None
-    
     try:
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        # Save uploaded file
-        file_path = os.path.join(PDF_FOLDER, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Extract text from PDF
-        text_data = extract_text_from_pdf(file_path)
-        log(f"PDF text extraction result: {len(text_data)} lines")
+        # Save uploaded file under its content hash
+        digest, file_path = await run_in_threadpool(save_upload_hashed, file, PDF_FOLDER)
         
-        if not text_data:
-            raise Exception("No text could be extracted from the PDF")
+        # The archive is named by content, so the same PDF maps to the same ZIP
+        zip_filename = f"screenshots_{digest[:16]}.zip"
+        zip_path = os.path.join(FRAMES_FOLDER, zip_filename)
+        screenshots = None if force_refresh else content_store.load(digest, SCREENSHOTS_VARIANT)
+        if screenshots is not None and os.path.exists(zip_path):
+            log(f"Reusing screenshots from an earlier upload of the same PDF ({digest[:12]})")
+        else:
+            screenshots = await run_in_threadpool(extract_screenshots_zip, file_path, zip_path, log_callback=log)
+            content_store.save(digest, SCREENSHOTS_VARIANT, screenshots)
         
-        # Process with AI
-        helper = ChatGPTHelper(api_key)
-        test_cases = helper.generate_test_cases("\n".join(text_data))
+        test_cases = None if force_refresh else (content_store.load(digest, "scribe-ai") or {}).get("test_cases")
+        if test_cases:
+            log(f"Reusing AI test cases from an earlier upload of the same PDF ({digest[:12]})")
+        else:
+            # Extract text from PDF
+            # Rendering and OCR of image-only pages must not hold up the event loop
+            text_data = await run_in_threadpool(_extract_pdf_text_cached, digest, file_path, force_refresh, log)
+            log(f"PDF text extraction result: {len(text_data)} pages, {_count_lines(text_data)} lines")
+            
+            if not text_data:
+                raise Exception("No text could be extracted from the PDF")
+            
+            # Process with AI
+            helper = ChatGPTHelper(api_key)
+            test_cases = await helper.generate_test_cases(_prompt_text(text_data, log))
+            content_store.save(digest, "scribe-ai", {"test_cases": test_cases})
         
         return JSONResponse(
             status_code=200,
             content={
                 "test_cases": test_cases,
+                "zip_url": f"/api/video/download-screenshots/{zip_filename}",
+                "image_count": screenshots["image_count"],
+                "duplicate_count": screenshots["duplicates"],
                 "logs": logs
             }
         )
+    except HTTPException as he:
+        raise he
     except Exception as e:
         log(f"Error processing file: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={"error": str(e), "logs": logs}
         )
-    finally:
-        # Cleanup uploaded file
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
-        # Don't remove screenshots_dir here as we need it for the ZIP file
-        if screenshots_dir and os.path.exists(screenshots_dir):
-            log(f"WARNING: Cleaning up screenshots directory that should be kept: {screenshots_dir}")
-            # We should not reach here if everything works correctly
-            # shutil.rmtree(screenshots_dir)
+    # The uploaded file is stored under its content hash and may be in use by
+    # a concurrent upload of the same PDF, so it is left for reuse; the ZIP
+    # stays for /download-screenshots and is evicted by the disk GC.
 
 @router.get("/frame/{dir_name}/{file_name}")
 async def get_screenshot(dir_name: str, file_name: str):
@@ -1136,8 +1486,8 @@ async def get_screenshot(dir_name: str, file_name: str):
 async def download_screenshots(zip_filename: str):
     """Download a ZIP file containing screenshots"""
     try:
-        file_path = os.path.join(FRAMES_FOLDER, zip_filename)
-        if not os.path.exists(file_path):
+        file_path = os.path.join(FRAMES_FOLDER, os.path.basename(zip_filename))
+        if not zip_filename.endswith(".zip") or not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="ZIP file not found")
         
         return FileResponse(
@@ -1145,6 +1495,8 @@ async def download_screenshots(zip_filename: str):
             media_type="application/zip",
             filename=zip_filename
         )
+    except HTTPException as he:
+        raise he
     except Exception as e:
         print(f"Error downloading screenshots: {str(e)}")
         import traceback
@@ -1208,7 +1560,7 @@ async def analyze_issue(request: dict):
         # Get AI analysis
         print(f"[Debug] Generating analysis using ChatGPT")
         chatgpt_helper = ChatGPTHelper(chatgpt_api_key)
-        analysis = chatgpt_helper.generate_response([{
+        analysis = await chatgpt_helper.generate_response([{
             "role": "system",
             "content": "You are a helpful assistant analyzing software issues."
         }, {
@@ -1279,7 +1631,7 @@ async def check_necessary_info(request: dict):
         
         # Get AI analysis
         chatgpt_helper = ChatGPTHelper(chatgpt_api_key)
-        analysis = chatgpt_helper.generate_response([{
+        analysis = await chatgpt_helper.generate_response([{
             "role": "system",
             "content": "You are a helpful assistant analyzing JIRA issues for necessary information."
         }, {
@@ -1,7 +1,7 @@
-import openai
 from typing import List
 import os
 from dotenv import load_dotenv
+from app.utils.llm_client import get_llm_client
 
 # Load environment variables
 load_dotenv()
@@ -10,16 +10,17 @@ class ChatGPTHelper:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self.model = "gpt-3.5-turbo"
-        openai.api_key = self.api_key
         
-        if not openai.api_key:
+        if not self.api_key:
             raise ValueError("No API key provided and OPENAI_API_KEY not found in environment")
+        # Client for this key only; openai.api_key is never set
+        self.client = get_llm_client(self.api_key)
         
-    def verify_connection(self) -> bool:
+    async def verify_connection(self) -> bool:
         try:
             # Add debug logging
-            print(f"Attempting to verify ChatGPT connection with API key: {openai.api_key[:10]}...")
-            response = openai.ChatCompletion.create(
+            print(f"Attempting to verify ChatGPT connection with API key: {self.api_key[:10]}...")
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=5
@@ -30,9 +31,9 @@ class ChatGPTHelper:
             print(f"ChatGPT Connection Error Details: {str(e)}")
             return False
 
-    def generate_response(self, messages: List[dict]) -> str:
+    async def generate_response(self, messages: List[dict]) -> str:
         try:
-            response = openai.ChatCompletion.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=messages,
                 temperature=0.7,
@@ -46,7 +47,7 @@ class ChatGPTHelper:
             print(f"Error in generating response: {str(e)}")
             return None 
 
-    def generate_test_cases(self, user_story: str) -> str:
+    async def generate_test_cases(self, user_story: str) -> str:
         """Generate test cases from a user story"""
         try:
             prompt = f"""
@@ -103,7 +104,7 @@ class ChatGPTHelper:
             - State transitions
             """
             
-            response = openai.ChatCompletion.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=[{
                     "role": "system",
@@ -227,9 +228,9 @@ class ChatGPTHelper:
             print(f"Error formatting test cases: {str(e)}")
             return response  # Return original response if formatting fails 
 
-    def generate_automation_script(self, prompt: str) -> str:
+    async def generate_automation_script(self, prompt: str) -> str:
         try:
-            response = openai.ChatCompletion.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=[{
                     "role": "user",
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import tempfile
+
+# Processing results are stored per upload content hash, so the same video or
+# Scribe PDF uploaded again (by anyone, under any name) is not reprocessed.
+# Results can always be recomputed: the disk GC evicts the least recently
+# used digests (loading a result marks its digest as used).
+CONTENT_STORE_FOLDER = os.getenv("CONTENT_STORE_FOLDER", "content_store")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def save_upload_hashed(file, folder):
+    """Stream an UploadFile to disk while hashing it.
+
+    The file is stored as <folder>/<sha256><ext>, so identical uploads share
+    one copy. Returns (sha256, file_path).
+    """
+    os.makedirs(folder, exist_ok=True)
+    extension = os.path.splitext(file.filename)[1].lower()
+    digest = hashlib.sha256()
+    fd, temp_path = tempfile.mkstemp(dir=folder, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = file.file.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                buffer.write(chunk)
+        file_path = os.path.join(folder, f"{digest.hexdigest()}{extension}")
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return digest.hexdigest(), file_path
+
+def variant_key(name, options=None):
+    """Name a stored result after the processing step and the options that affect it"""
+    if not options:
+        return name
+    options_hash = hashlib.sha1(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return f"{name}-{options_hash}"
+
+class ContentStore:
+    """JSON results of processing steps, keyed by upload content hash and variant"""
+
+    def __init__(self, root=CONTENT_STORE_FOLDER):
+        self.root = root
+
+    def _path(self, digest, variant):
+        return os.path.join(self.root, digest[:2], digest, f"{variant}.json")
+
+    def load(self, digest, variant):
+        """Return the stored result or None"""
+        path = self._path(digest, variant)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            os.utime(os.path.dirname(path))
+        except FileNotFoundError:
+            pass  # evicted since; the result read is still valid
+        return result
+
+    def save(self, digest, variant, result):
+        path = self._path(digest, variant)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(temp_path, path)
+
+content_store = ContentStore()
@@ -0,0 +1,201 @@
+import os
+import shutil
+import threading
+import time
+
+from app.utils.job_manager import job_manager
+from app.utils.workspace import WORKSPACES_FOLDER, WORKSPACE_RETENTION_HOURS
+
+# Background garbage collection of the folders uploads and jobs write to.
+# Every DISK_GC_INTERVAL_SECONDS it removes entries older than their age
+# budget, then, while the folders together use more than DISK_QUOTA_MB,
+# evicts least recently used entries: job workspaces first, then uploads and
+# other caches. Workspaces of running jobs and anything used within the last
+# DISK_GC_MIN_AGE_SECONDS (e.g. an upload a job in another worker is reading)
+# are never touched.
+DISK_GC_ENABLED = os.getenv("DISK_GC_ENABLED", "true").lower() in ("1", "true", "yes")
+DISK_GC_INTERVAL_SECONDS = int(os.getenv("DISK_GC_INTERVAL_SECONDS", "600"))
+DISK_QUOTA_MB = float(os.getenv("DISK_QUOTA_MB", "10240"))
+DISK_MAX_AGE_HOURS = float(os.getenv("DISK_MAX_AGE_HOURS", "168"))
+DISK_GC_MIN_AGE_SECONDS = int(os.getenv("DISK_GC_MIN_AGE_SECONDS", "3600"))
+# Eviction stops once usage is back under this share of the quota
+DISK_GC_LOW_WATERMARK = 0.9
+
+WORKSPACES_AREA = "workspaces"
+
+def _entry_size(path):
+    """Bytes used by a file or, recursively, a directory"""
+    try:
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+    except OSError:
+        return 0
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # removed while we were walking
+    return total
+
+def _last_used(entry):
+    """Last use of a folder entry: mtime for directories (scanning them bumps atime), else atime or mtime"""
+    st = entry.stat()
+    if entry.is_dir():
+        return st.st_mtime
+    return max(st.st_atime, st.st_mtime)
+
+class DiskGC:
+    """Size and age budgets for the storage folders, enforced by a background thread"""
+
+    def __init__(self, quota_bytes=DISK_QUOTA_MB * 1024 * 1024, interval=DISK_GC_INTERVAL_SECONDS):
+        self.quota_bytes = quota_bytes
+        self.interval = interval
+        # name -> (folder, max age in seconds or None when entries are never evicted)
+        self._areas = {WORKSPACES_AREA: (WORKSPACES_FOLDER, WORKSPACE_RETENTION_HOURS * 3600)}
+        # Areas whose entries are the files inside shard subdirectories
+        self._sharded = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = None
+
+    def register_area(self, name, folder, evictable=True, max_age_hours=DISK_MAX_AGE_HOURS, sharded=False):
+        """Include a folder in usage figures and, if evictable, in age and size eviction.
+
+        sharded=True is for caches that spread their files over subdirectories
+        (ab/abcd...): the files are aged and evicted one by one, since a
+        directory's mtime says nothing about when its files were last read.
+        """
+        self._areas[name] = (folder, max_age_hours * 3600 if evictable else None)
+        if sharded:
+            self._sharded.add(name)
+        else:
+            self._sharded.discard(name)
+
+    def _scan(self):
+        """List (area, path, size, last_used) of every top-level entry (or sharded file) of every area"""
+        entries = []
+        for name, (folder, _) in self._areas.items():
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                try:
+                    if name in self._sharded and entry.is_dir():
+                        for item in os.scandir(entry.path):
+                            try:
+                                entries.append((name, item.path, _entry_size(item.path), _last_used(item)))
+                            except FileNotFoundError:
+                                continue
+                        continue
+                    entries.append((name, entry.path, _entry_size(entry.path), _last_used(entry)))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def _usage(self, entries):
+        areas = {name: {"folder": folder, "bytes": 0, "entries": 0, "evictable": max_age is not None}
+                 for name, (folder, max_age) in self._areas.items()}
+        for name, _, size, _ in entries:
+            areas[name]["bytes"] += size
+            areas[name]["entries"] += 1
+        return {
+            "areas": areas,
+            "total_bytes": sum(area["bytes"] for area in areas.values()),
+            "quota_bytes": int(self.quota_bytes)
+        }
+
+    def usage(self):
+        """Current usage per area and in total, plus the figures of the last GC run"""
+        return {**self._usage(self._scan()), "last_run": self.last_run}
+
+    def run_once(self, log_callback=print):
+        """Apply the age budgets, then the size quota. Returns a report of what was removed"""
+        with self._lock:
+            start = time.time()
+            active = job_manager.active_job_ids()
+            entries = self._scan()
+            total = sum(size for _, _, size, _ in entries)
+            removed = {"entries": 0, "bytes": 0, "expired": 0, "over_quota": 0}
+
+            def evictable(entry):
+                name, path, _, last_used = entry
+                max_age = self._areas[name][1]
+                if max_age is None or last_used > start - DISK_GC_MIN_AGE_SECONDS:
+                    return False
+                return not (name == WORKSPACES_AREA and os.path.basename(path) in active)
+
+            def remove(entry, reason):
+                nonlocal total
+                _, path, size, _ = entry
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                removed["entries"] += 1
+                removed["bytes"] += size
+                removed[reason] += 1
+
+            candidates = [entry for entry in entries if evictable(entry)]
+            remaining = []
+            for entry in candidates:
+                if entry[3] < start - self._areas[entry[0]][1]:
+                    remove(entry, "expired")
+                else:
+                    remaining.append(entry)
+
+            if total > self.quota_bytes:
+                # Job workspaces go first, least recently used first within each group
+                remaining.sort(key=lambda entry: (entry[0] != WORKSPACES_AREA, entry[3]))
+                target = self.quota_bytes * DISK_GC_LOW_WATERMARK
+                for entry in remaining:
+                    if total <= target:
+                        break
+                    remove(entry, "over_quota")
+                if total > self.quota_bytes:
+                    log_callback(f"Disk GC: still {total / 1048576:.0f} MB in use, over the "
+                                 f"{self.quota_bytes / 1048576:.0f} MB quota; the rest is in use or not evictable")
+
+            self.last_run = {
+                "finished_at": time.time(),
+                "seconds": round(time.time() - start, 3),
+                "total_bytes": total,
+                "removed_entries": removed["entries"],
+                "removed_bytes": removed["bytes"],
+                "expired": removed["expired"],
+                "over_quota": removed["over_quota"]
+            }
+            if removed["entries"]:
+                log_callback(f"Disk GC: removed {removed['entries']} entries ({removed['bytes'] / 1048576:.1f} MB; "
+                             f"{removed['expired']} expired, {removed['over_quota']} over quota)")
+            return self.last_run
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Disk GC failed: {str(e)}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        """Start the background GC thread (no-op when disabled or already running)"""
+        if not DISK_GC_ENABLED or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="disk-gc", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+disk_gc = DiskGC()
@@ -0,0 +1,84 @@
+import os
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Decoded frames reach the OCR worker processes through a ring of
+# shared-memory slots instead of being pickled through a pipe. The decoder
+# copies each frame into a free slot once and the worker reads it in place.
+OCR_SHARED_MEMORY = os.getenv("OCR_SHARED_MEMORY", "true").lower() in ("1", "true", "yes")
+
+class FrameRef:
+    """Picklable pointer to a frame stored in a FrameRing slot"""
+
+    __slots__ = ("shm_name", "offset", "shape", "dtype")
+
+    def __init__(self, shm_name, offset, shape, dtype):
+        self.shm_name = shm_name
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.shm_name, self.offset, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.shm_name, self.offset, self.shape, self.dtype = state
+
+class FrameRing:
+    """Fixed number of equally sized frame slots in one shared-memory block.
+
+    write() blocks while every slot is taken, so the decoder can never run
+    more than `slots` frames ahead of the OCR workers and memory stays at
+    slots * slot_bytes however long the video is. A slot is handed back with
+    release() once the worker reading it has finished.
+    """
+
+    def __init__(self, slots, slot_bytes):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self._free = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    def fits(self, frame):
+        return frame.nbytes <= self.slot_bytes
+
+    def write(self, frame, timeout=None):
+        """Copy a frame into a free slot, waiting for one if needed. Returns (slot, FrameRef)"""
+        slot = self._free.get(timeout=timeout)
+        offset = slot * self.slot_bytes
+        target = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self._shm.buf, offset=offset)
+        target[...] = frame
+        del target  # no buffer exports may outlive the block, or close() fails
+        return slot, FrameRef(self._shm.name, offset, frame.shape, frame.dtype.str)
+
+    def release(self, slot):
+        self._free.put(slot)
+
+    def close(self):
+        """Free the shared memory block; call once no worker reads from it anymore"""
+        self._shm.close()
+        self._shm.unlink()
+
+def run_on_shared_frame(func, ref):
+    """Call func on the frame a FrameRef points to (executed inside a worker process)
+
+    The block is attached for this one task and closed afterwards, so a
+    long-lived worker keeps no ring mapped once its job has released it.
+    Attaching costs far less than the OCR of the frame.
+    """
+    shm = shared_memory.SharedMemory(name=ref.shm_name)
+    try:
+        frame = np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf, offset=ref.offset)
+        try:
+            return func(frame)
+        finally:
+            del frame
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # func kept a view of the frame; the mapping goes when that view does
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app.utils.workspace import create_workspace, read_job_state, write_job_state
+
+# Upload jobs run here instead of on the uvicorn event loop. The heavy lifting
+# (OCR) already fans out to the OCR process pool, so a few threads suffice.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Finished jobs are forgotten after this many seconds
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+JOB_EVENT_POLL_SECONDS = 0.5
+# Minimum interval between job.json rewrites while a job is running
+JOB_STATE_PERSIST_SECONDS = 1.0
+
+class Job:
+    """State, progress counters and logs of one background job"""
+
+    def __init__(self, kind, workspace=False):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        # Jobs with a workspace get a private directory for their outputs and
+        # persist their state there, so any uvicorn worker can report on them
+        self.workspace = create_workspace(self.id) if workspace else None
+        self._persisted_at = 0.0
+        self.status = "queued"
+        self.progress = {}
+        self.logs = []
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.future = None
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _touch(self, force_persist=False):
+        self.version += 1
+        if self.workspace and (force_persist or time.time() - self._persisted_at >= JOB_STATE_PERSIST_SECONDS):
+            self._persisted_at = time.time()
+            write_job_state(self.workspace, self._state())
+
+    def log(self, message):
+        print(message)
+        with self._lock:
+            self.logs.append(message)
+            self._touch()
+
+    def update_progress(self, **counts):
+        with self._lock:
+            self.progress.update(counts)
+            self._touch()
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self._touch(force_persist=True)
+
+    @property
+    def done(self):
+        return self.status in ("completed", "failed")
+
+    def _state(self):
+        state = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "logs": list(self.logs),
+            "created_at": self.created_at,
+            "error": self.error,
+            "version": self.version
+        }
+        if self.done:
+            state["result"] = self.result
+        return state
+
+    def to_dict(self, logs_since=0, include_result=True):
+        with self._lock:
+            return _state_view(self._state(), logs_since, include_result)
+
+def _state_view(state, logs_since=0, include_result=True):
+    """Shape a job state for API responses: only logs after logs_since, optional result"""
+    data = dict(state)
+    data["log_count"] = len(state["logs"])
+    data["logs"] = state["logs"][logs_since:]
+    if not include_result:
+        data.pop("result", None)
+    return data
+
+class JobManager:
+    """Runs jobs on a dedicated thread pool and keeps their state for polling and streaming"""
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, func, *args, with_workspace=False, **kwargs):
+        """Queue func(job, *args, **kwargs); its return value becomes the job result"""
+        self._prune()
+        job = Job(kind, workspace=with_workspace)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        with job._lock:
+            job.status = "running"
+            job._touch(force_persist=True)
+        try:
+            result = func(job, *args, **kwargs)
+        except Exception as e:
+            job.log(f"Error processing job {job.id}: {str(e)}")
+            job.log(traceback.format_exc())
+            job._finish("failed", error=str(e))
+            raise
+        job._finish("completed", result=result)
+        return result
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_state(self, job_id, logs_since=0, include_result=True):
+        """State of a job run by this process, or persisted by another worker; None if unknown"""
+        job = self.get(job_id)
+        if job:
+            return job.to_dict(logs_since, include_result)
+        state = read_job_state(job_id)
+        if state is None:
+            return None
+        return _state_view(state, logs_since, include_result)
+
+    def active_job_ids(self):
+        """Ids of jobs that are queued or running"""
+        with self._lock:
+            return {job_id for job_id, job in self._jobs.items() if not job.done}
+
+    def _prune(self):
+        cutoff = time.time() - JOB_TTL_SECONDS
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job.done and job.finished_at < cutoff]:
+                del self._jobs[job_id]
+
+    async def wait(self, job):
+        """Await a job's completion without blocking the event loop"""
+        try:
+            await asyncio.wrap_future(job.future)
+        except Exception:
+            pass  # the failure is recorded on the job
+        return job
+
+    async def events(self, job_id):
+        """Server-Sent Events stream of a job's progress and new log lines until it finishes"""
+        sent_version = -1
+        sent_logs = 0
+        while True:
+            state = self.get_state(job_id, logs_since=sent_logs, include_result=False)
+            if state is None:
+                return
+            done = state["status"] in ("completed", "failed")
+            if done:
+                state = self.get_state(job_id, logs_since=sent_logs)
+                yield f"event: {state['status']}\ndata: {json.dumps(state)}\n\n"
+                return
+            if state["version"] != sent_version:
+                sent_version = state["version"]
+                sent_logs = state["log_count"]
+                yield f"event: progress\ndata: {json.dumps(state)}\n\n"
+            await asyncio.sleep(JOB_EVENT_POLL_SECONDS)
+
+job_manager = JobManager()
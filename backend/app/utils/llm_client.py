@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import aiohttp
+import openai
+
+# All LLM calls share one aiohttp session: its connector keeps HTTPS
+# connections to the API open between requests (no TCP and TLS handshake
+# per generation) and caps how many requests are in flight at once.
+# openai's acreate uses the session set in openai.aiosession, else it opens
+# and closes a new one for every call.
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "64"))
+# Seconds an idle connection is kept open for the next request
+LLM_KEEPALIVE_TIMEOUT = float(os.getenv("LLM_KEEPALIVE_TIMEOUT", "60"))
+# Seconds a single completion may take before it is abandoned
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+# API keys arrive with each request. Every key gets its own client, which
+# passes the key with each call instead of setting the process-wide
+# openai.api_key, so concurrent requests cannot use each other's key.
+# Clients unused for this many seconds are dropped
+LLM_CLIENT_TTL_SECONDS = float(os.getenv("LLM_CLIENT_TTL_SECONDS", "900"))
+LLM_CLIENT_CACHE_SIZE = int(os.getenv("LLM_CLIENT_CACHE_SIZE", "256"))
+
+class LLMConnectionPool:
+    """Keep-alive HTTP connections shared by all LLM clients"""
+
+    def __init__(self, max_connections=LLM_MAX_CONNECTIONS, keepalive_timeout=LLM_KEEPALIVE_TIMEOUT):
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._loop = None
+
+    def session(self):
+        """The shared session, created on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session cannot be used from another loop (a second event loop
+            # in tests or scripts); that loop owns and cleans up the old one
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             keepalive_timeout=self.keepalive_timeout,
+                                             ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+class LLMClient:
+    """Async chat completions made with one API key"""
+
+    def __init__(self, api_key, pool=None, request_timeout=LLM_REQUEST_TIMEOUT):
+        self.api_key = api_key
+        self.pool = pool or llm_pool
+        self.request_timeout = request_timeout
+
+    async def chat_completion(self, messages, model, **params):
+        """Await a ChatCompletion without blocking the event loop"""
+        # The key goes in this request's headers only; connections carry no
+        # credentials, so the pool is safely shared between keys
+        token = openai.aiosession.set(self.pool.session())
+        try:
+            return await openai.ChatCompletion.acreate(model=model, messages=messages, api_key=self.api_key,
+                                                       request_timeout=self.request_timeout, **params)
+        finally:
+            openai.aiosession.reset(token)
+
+class LLMClientCache:
+    """LLM clients by API key, dropped after ttl seconds unused"""
+
+    def __init__(self, ttl=LLM_CLIENT_TTL_SECONDS, max_size=LLM_CLIENT_CACHE_SIZE, pool=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.pool = pool
+        self._clients = OrderedDict()  # key digest -> (client, expiry), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, api_key):
+        if not api_key:
+            raise ValueError("An API key is required")
+        # Index by digest so raw keys are not kept as dictionary keys
+        digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            while self._clients and next(iter(self._clients.values()))[1] <= now:
+                self._clients.popitem(last=False)
+            entry = self._clients.pop(digest, None)
+            client = entry[0] if entry is not None else LLMClient(api_key, self.pool)
+            self._clients[digest] = (client, now + self.ttl)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self):
+        return len(self._clients)
+
+llm_pool = LLMConnectionPool()
+llm_clients = LLMClientCache()
+
+def get_llm_client(api_key):
+    """The cached client for api_key"""
+    return llm_clients.get(api_key)
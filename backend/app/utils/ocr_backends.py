@@ -0,0 +1,78 @@
+import os
+import threading
+
+import pytesseract
+
+# tesserocr wraps the Tesseract C API, so the engine and its language data
+# stay loaded between images. It needs libtesseract at build time, so it is
+# optional and pytesseract (one tesseract subprocess per image) is the fallback.
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# "auto" prefers tesserocr when it is installed, otherwise uses pytesseract
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto")
+OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")
+
+class PytesseractBackend:
+    """Runs the tesseract binary once per image through pytesseract"""
+    name = "pytesseract"
+
+    def __init__(self, lang=OCR_LANGUAGE):
+        self.lang = lang
+
+    def image_to_string(self, image, psm=None):
+        config = f"--psm {psm}" if psm is not None else ""
+        return pytesseract.image_to_string(image, lang=self.lang, config=config)
+
+class TesserocrBackend:
+    """Keeps a single Tesseract engine (with its model loaded) alive and reuses it for every image"""
+    name = "tesserocr"
+
+    def __init__(self, lang=OCR_LANGUAGE):
+        self.lang = lang
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+        self._default_psm = self._api.GetPageSegMode()
+
+    def image_to_string(self, image, psm=None):
+        self._api.SetPageSegMode(self._default_psm if psm is None else psm)
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+    def close(self):
+        self._api.End()
+
+def _create_backend(name):
+    if name == "tesserocr" or (name == "auto" and TESSEROCR_AVAILABLE):
+        try:
+            return TesserocrBackend()
+        except Exception as e:
+            if name == "tesserocr":
+                raise
+            print(f"tesserocr engine could not be initialised ({e}), falling back to pytesseract")
+    if name not in ("auto", "tesserocr", "pytesseract"):
+        raise ValueError(f"Unknown OCR backend '{name}'. Expected auto, tesserocr or pytesseract")
+    return PytesseractBackend()
+
+# Tesseract engines are not thread safe, so each thread (and therefore each
+# OCR worker process) gets its own long-lived instance
+_local = threading.local()
+
+def get_ocr_backend(name=None):
+    """Return this thread's OCR engine, creating it on first use"""
+    name = name or OCR_BACKEND
+    backends = getattr(_local, "backends", None)
+    if backends is None:
+        backends = _local.backends = {}
+    if name not in backends:
+        backends[name] = _create_backend(name)
+    return backends[name]
+
+def check_ocr_available(name=None):
+    """Raise if the configured OCR backend cannot run on this machine"""
+    backend = get_ocr_backend(name)
+    if backend.name == "tesserocr":
+        return tesserocr.tesseract_version()
+    return pytesseract.get_tesseract_version()
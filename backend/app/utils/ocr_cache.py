@@ -0,0 +1,232 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# On-disk OCR result cache shared by all uploads (and all uvicorn workers).
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", "ocr_cache")
+OCR_CACHE_MAX_MB = float(os.getenv("OCR_CACHE_MAX_MB", "512"))
+
+# Entries are found by a 64-bit DCT perceptual hash, which tolerates
+# re-encoding noise but is too coarse to tell two screens apart that differ
+# by a word. Every candidate is therefore verified against a stored grayscale
+# thumbnail: a hit needs (almost) no pixel to differ by more than
+# SIGNATURE_PIXEL_DELTA, so a changed digit is a miss, not wrong text.
+SIGNATURE_WIDTH = 320
+SIGNATURE_PIXEL_DELTA = 24
+SIGNATURE_MAX_CHANGED_FRACTION = 0.0001
+
+def _to_gray(image):
+    """Grayscale uint8 array from a BGR/gray NumPy frame, a PIL image or an image path"""
+    if isinstance(image, str):
+        return cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("L"))
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+def perceptual_hash(gray):
+    """64-bit DCT perceptual hash of a grayscale image, as 16 hex characters"""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+class OCRCacheKey:
+    """Perceptual hash plus verification thumbnail of one image"""
+
+    def __init__(self, image, variant=""):
+        gray = _to_gray(image)
+        height, width = gray.shape[:2]
+        scaled_height = max(1, int(height * SIGNATURE_WIDTH / width))
+        self.phash = perceptual_hash(gray)
+        self.signature = cv2.resize(gray, (SIGNATURE_WIDTH, scaled_height), interpolation=cv2.INTER_AREA)
+        self.variant = variant or "default"
+        self.digest = hashlib.sha1(self.signature.tobytes()).hexdigest()[:16]
+
+    @property
+    def prefix(self):
+        return f"{self.phash}-{self.variant}-"
+
+    @property
+    def name(self):
+        return f"{self.prefix}{self.digest}"
+
+    def matches(self, signature):
+        if signature is None or signature.shape != self.signature.shape:
+            return False
+        diff = cv2.absdiff(signature, self.signature)
+        changed = np.count_nonzero(diff > SIGNATURE_PIXEL_DELTA)
+        return changed <= SIGNATURE_MAX_CHANGED_FRACTION * diff.size
+
+def _write_atomic(directory, path, data):
+    """Write data to path through a uniquely named temp file and a rename.
+
+    Several jobs or workers may store the same key at once; each writes its
+    own temp file and the last rename wins.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class OCRCache:
+    """Disk cache of OCR text keyed by perceptual hash, with LRU eviction under a size cap"""
+
+    def __init__(self, cache_dir=OCR_CACHE_DIR, max_bytes=OCR_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.ocr_seconds = 0.0
+        self.ocr_frames = 0
+
+    def _shard(self, key):
+        return os.path.join(self.cache_dir, key.phash[:2])
+
+    def lookup(self, image, variant=""):
+        """Return (key, text); text is None on a miss"""
+        key = OCRCacheKey(image, variant)
+        shard = self._shard(key)
+        text = None
+        try:
+            candidates = sorted(name for name in os.listdir(shard)
+                                if name.startswith(key.prefix) and name.endswith(".txt"))
+        except FileNotFoundError:
+            candidates = []
+
+        # Identical thumbnail first, then any candidate that passes verification
+        exact = f"{key.name}.txt"
+        if exact in candidates:
+            candidates.remove(exact)
+            candidates.insert(0, exact)
+        for name in candidates:
+            base = os.path.join(shard, name[:-len(".txt")])
+            if name != exact and not key.matches(cv2.imread(f"{base}.png", cv2.IMREAD_GRAYSCALE)):
+                continue
+            try:
+                with open(f"{base}.txt", encoding="utf-8") as f:
+                    text = f.read()
+                os.utime(f"{base}.txt")  # mark as recently used for LRU eviction
+                break
+            except FileNotFoundError:
+                continue  # evicted by another worker in the meantime
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return key, text
+
+    def store(self, key, text):
+        """Store OCR text for a key returned by lookup"""
+        shard = self._shard(key)
+        os.makedirs(shard, exist_ok=True)
+        base = os.path.join(shard, key.name)
+        signature = cv2.imencode(".png", key.signature)[1].tobytes()
+        data = text.encode("utf-8")
+        # Text is written last so readers never see a partial entry
+        _write_atomic(shard, f"{base}.png", signature)
+        _write_atomic(shard, f"{base}.txt", data)
+
+        added = len(signature) + len(data)
+        with self._lock:
+            self.stores += 1
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += added
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def record_ocr_time(self, seconds, frames):
+        """Record how long real OCR took, to estimate the time saved by hits"""
+        with self._lock:
+            self.ocr_seconds += seconds
+            self.ocr_frames += frames
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".txt"):
+                    base = entry.path[:-len(".txt")]
+                    try:
+                        size = entry.stat().st_size + os.path.getsize(f"{base}.png")
+                    except FileNotFoundError:
+                        continue
+                    entries.append((entry.stat().st_mtime, size, base))
+        return entries
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache is back under 90% of its cap"""
+        with self._lock:
+            entries = sorted(self._entries())
+            size = sum(entry_size for _, entry_size, _ in entries)
+            target = self.max_bytes * 0.9
+            for _, entry_size, base in entries:
+                if size <= target:
+                    break
+                for suffix in (".txt", ".png"):
+                    try:
+                        os.remove(base + suffix)
+                    except FileNotFoundError:
+                        pass
+                size -= entry_size
+                self.evictions += 1
+            self._size = size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            seconds_per_frame = self.ocr_seconds / self.ocr_frames if self.ocr_frames else 0.0
+            return {
+                "enabled": OCR_CACHE_ENABLED,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "size_bytes": self._size if self._size is not None else self._disk_usage(),
+                "max_bytes": int(self.max_bytes),
+                "estimated_ocr_seconds_saved": round(self.hits * seconds_per_frame, 2)
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_ocr_cache():
+    """Return the process-wide OCR cache, or None when caching is disabled"""
+    global _cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = OCRCache()
+        return _cache
@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+from app.utils.frame_ring import FrameRing, run_on_shared_frame
+from app.utils.ocr_backends import get_ocr_backend
+
+# Number of OCR worker processes. Each tesseract call is single threaded work
+# in its own process, so one worker per core keeps the box busy.
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))
+
+def _init_worker():
+    """Load the OCR engine once when a worker process starts, not on its first image"""
+    get_ocr_backend()
+
+def _ocr_image_file(image_path):
+    """Run OCR on a single image file (executed inside a worker process)"""
+    with Image.open(image_path) as image:
+        return get_ocr_backend().image_to_string(image)
+
+def ocr_image(image):
+    """Run OCR on a PIL image (executed inside a worker process)"""
+    return get_ocr_backend().image_to_string(image)
+
+def ocr_frame(frame):
+    """Run OCR on a decoded BGR/grayscale NumPy frame (executed inside a worker process)"""
+    if frame.ndim == 3:
+        frame = frame[:, :, ::-1].copy()  # BGR -> RGB
+    return get_ocr_backend().image_to_string(Image.fromarray(frame))
+
+def _release_slot(ring, slot, future):
+    ring.release(slot)
+
+class OCRWorkerPool:
+    """Process pool that runs OCR in parallel and returns results in input order"""
+
+    def __init__(self, workers=None):
+        self.workers = max(1, int(workers or OCR_WORKERS))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork: the API process runs threads (uvicorn,
+                # executors) and forking those is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def imap(self, func, items, max_in_flight=None, cache=None, cache_variant="", shared_memory=False):
+        """Apply func to every item in the worker processes, yielding results in order.
+
+        items may be a lazy generator; at most max_in_flight items (default two
+        per worker) are submitted ahead of the consumer, which bounds memory
+        and keeps the producer from racing ahead of OCR. With an OCRCache,
+        images it has already seen are answered without reaching a worker and
+        new results are stored. With shared_memory=True, NumPy frames are
+        passed to the workers through a FrameRing instead of being pickled.
+        """
+        executor = self._get_executor()
+        window = max_in_flight or self.workers * 2
+        pending = deque()
+        submitted = 0
+        start = time.perf_counter()
+        ring = None
+
+        def submit(item):
+            nonlocal ring
+            if not shared_memory or not isinstance(item, np.ndarray):
+                return executor.submit(func, item)
+            if ring is None:
+                # Sized from the first frame: every frame of a video has the same shape
+                ring = FrameRing(window, item.nbytes)
+            if not ring.fits(item):
+                return executor.submit(func, item)
+            slot, ref = ring.write(item)
+            future = executor.submit(run_on_shared_frame, func, ref)
+            future.add_done_callback(partial(_release_slot, ring, slot))
+            return future
+
+        def next_result():
+            key, future = pending.popleft()
+            result = future.result()
+            if key is not None:
+                try:
+                    cache.store(key, result)
+                except Exception as e:
+                    # A failed cache write must never fail OCR
+                    print(f"OCR cache store failed: {str(e)}")
+            return result
+
+        try:
+            for item in items:
+                key = None
+                if cache is not None:
+                    key, cached = cache.lookup(item, cache_variant)
+                    if cached is not None:
+                        future = Future()
+                        future.set_result(cached)
+                        pending.append((None, future))
+                        continue
+                pending.append((key, submit(item)))
+                submitted += 1
+                if len(pending) >= window:
+                    yield next_result()
+            while pending:
+                yield next_result()
+            if cache is not None and submitted:
+                cache.record_ocr_time((time.perf_counter() - start) * self.workers, submitted)
+        except BrokenProcessPool:
+            # A worker died (e.g. tesseract crashed hard); start fresh next time
+            self.shutdown()
+            raise
+        finally:
+            for _, future in pending:
+                future.cancel()
+            if ring is not None:
+                # Futures already running can't be cancelled; let them finish
+                # reading their slots before the shared memory goes away
+                wait([future for _, future in pending])
+                ring.close()
+
+    def ocr_files(self, image_paths, cache=None, func=None, cache_variant=""):
+        """OCR image files in parallel. Returns (texts, stats) with texts in input order"""
+        image_paths = list(image_paths)
+        start = time.perf_counter()
+        texts = list(self.imap(func or _ocr_image_file, image_paths, cache=cache, cache_variant=cache_variant))
+        return texts, self.throughput(len(image_paths), time.perf_counter() - start)
+
+    def throughput(self, frame_count, seconds):
+        """Throughput figures used to size the pool"""
+        frames_per_second = frame_count / seconds if seconds > 0 else 0.0
+        return {
+            "frames": frame_count,
+            "workers": self.workers,
+            "seconds": round(seconds, 3),
+            "frames_per_second": round(frames_per_second, 2),
+            "frames_per_second_per_worker": round(frames_per_second / self.workers, 2)
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def check_ocr_workers(workers):
+    """Raise ValueError unless workers is None or between 1 and OCR_WORKERS"""
+    if workers is not None and not 1 <= workers <= OCR_WORKERS:
+        raise ValueError(f"ocr_workers must be between 1 and {OCR_WORKERS}")
+
+def get_ocr_pool(workers=None):
+    """Return the shared OCR pool for the given worker count, creating it on first use.
+
+    Pools live for the whole process, so the count is capped at OCR_WORKERS:
+    there can never be more pools than that, nor more processes than a pool
+    of each size.
+    """
+    workers = min(max(1, int(workers or OCR_WORKERS)), OCR_WORKERS)
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = OCRWorkerPool(workers)
+        return _pools[workers]
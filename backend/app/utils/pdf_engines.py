@@ -0,0 +1,183 @@
+import io
+import os
+import threading
+
+from PIL import Image
+
+# PDF engines extract the text layer of each page, render pages for OCR and
+# pull embedded images (screenshots) out as stored in the file.
+# PyMuPDF (MuPDF) is by far the fastest at both; pdfplumber (pdfminer for
+# text, pdfium for rendering) and PyPDF2 + pdf2image (poppler's pdftoppm)
+# remain available. All of them are optional imports here.
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    from PyPDF2 import PdfReader
+    from pdf2image import convert_from_path, pdfinfo_from_path
+    PYPDF2_AVAILABLE = True
+except ImportError:
+    PYPDF2_AVAILABLE = False
+
+# "auto" picks the first available of pymupdf, pdfplumber, pypdf2
+PDF_ENGINE = os.getenv("PDF_ENGINE", "auto")
+
+class PyMuPDFEngine:
+    """Text and rendering through MuPDF"""
+    name = "pymupdf"
+
+    # MuPDF must not be used from several threads at once, even on separate documents,
+    # so pages are rendered one at a time
+    _lock = threading.Lock()
+    parallel_render = False
+
+    def page_count(self, pdf_path):
+        with self._lock, fitz.open(pdf_path) as doc:
+            return doc.page_count
+
+    def page_texts(self, pdf_path):
+        with self._lock, fitz.open(pdf_path) as doc:
+            return [page.get_text() for page in doc]
+
+    def render_page(self, pdf_path, page_number, dpi):
+        with self._lock, fitz.open(pdf_path) as doc:
+            pixmap = doc[page_number].get_pixmap(dpi=dpi)
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+    def iter_images(self, pdf_path):
+        """Yield (page_number, ext, data, width, height) for each embedded image.
+
+        JPEG and JPEG 2000 streams come out byte for byte; other encodings are
+        written as PNG by MuPDF. An image placed on several pages is yielded once.
+        """
+        with self._lock:
+            doc = fitz.open(pdf_path)
+        try:
+            seen = set()
+            for page_number in range(doc.page_count):
+                images = []
+                with self._lock:
+                    for image_info in doc[page_number].get_images(full=True):
+                        xref = image_info[0]
+                        if xref in seen:
+                            continue
+                        seen.add(xref)
+                        image = doc.extract_image(xref)
+                        if image:
+                            images.append((page_number, image["ext"], image["image"], image["width"], image["height"]))
+                yield from images
+        finally:
+            with self._lock:
+                doc.close()
+
+class PdfplumberEngine:
+    """Text through pdfminer, rendering through pdfium"""
+    name = "pdfplumber"
+
+    # pdfium is not thread safe either
+    _lock = threading.Lock()
+    parallel_render = False
+
+    def page_count(self, pdf_path):
+        with self._lock, pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def page_texts(self, pdf_path):
+        with self._lock, pdfplumber.open(pdf_path) as pdf:
+            texts = []
+            for page in pdf.pages:
+                texts.append(page.extract_text() or "")
+                page.close()  # drop the parsed layout, which is large
+            return texts
+
+    def render_page(self, pdf_path, page_number, dpi):
+        with self._lock, pdfplumber.open(pdf_path) as pdf:
+            return pdf.pages[page_number].to_image(resolution=dpi).original.convert("RGB")
+
+    # Filters whose raw stream is a complete image file
+    _IMAGE_FILTERS = {"DCTDecode": "jpeg", "JPXDecode": "jpx"}
+
+    def iter_images(self, pdf_path):
+        """Yield (page_number, ext, data, width, height) for each JPEG / JPEG 2000 image.
+
+        Images in other encodings would have to be decoded and re-encoded and are skipped.
+        """
+        with self._lock:
+            pdf = pdfplumber.open(pdf_path)
+        try:
+            seen = set()
+            for page_number, page in enumerate(pdf.pages):
+                images = []
+                with self._lock:
+                    for image in page.images:
+                        stream = image["stream"]
+                        filters = [getattr(name, "name", name) for name, _ in stream.get_filters()]
+                        if stream.objid in seen or len(filters) != 1 or filters[0] not in self._IMAGE_FILTERS:
+                            continue
+                        seen.add(stream.objid)
+                        width, height = image["srcsize"]
+                        images.append((page_number, self._IMAGE_FILTERS[filters[0]], stream.get_rawdata(),
+                                       int(width), int(height)))
+                    page.close()
+                yield from images
+        finally:
+            with self._lock:
+                pdf.close()
+
+class PyPDF2Engine:
+    """Text through PyPDF2, rendering through poppler's pdftoppm (one subprocess per page)"""
+    name = "pypdf2"
+    # Each page is rendered by its own pdftoppm process
+    parallel_render = True
+
+    def page_count(self, pdf_path):
+        return len(PdfReader(pdf_path).pages)
+
+    def page_texts(self, pdf_path):
+        return [page.extract_text() or "" for page in PdfReader(pdf_path).pages]
+
+    def render_page(self, pdf_path, page_number, dpi):
+        return convert_from_path(pdf_path, dpi=dpi, first_page=page_number + 1, last_page=page_number + 1)[0]
+
+    def iter_images(self, pdf_path):
+        """Yield (page_number, ext, data, width, height) for each embedded image.
+
+        PyPDF2 passes JPEG and JPEG 2000 streams through and re-encodes the rest as PNG.
+        """
+        for page_number, page in enumerate(PdfReader(pdf_path).pages):
+            for image in page.images:
+                width, height = Image.open(io.BytesIO(image.data)).size
+                yield page_number, os.path.splitext(image.name)[1].lstrip(".").lower(), image.data, width, height
+
+PDF_ENGINES = {
+    "pymupdf": (PyMuPDFEngine, PYMUPDF_AVAILABLE),
+    "pdfplumber": (PdfplumberEngine, PDFPLUMBER_AVAILABLE),
+    "pypdf2": (PyPDF2Engine, PYPDF2_AVAILABLE),
+}
+
+def available_pdf_engines():
+    return [name for name, (_, available) in PDF_ENGINES.items() if available]
+
+def get_pdf_engine(name=None):
+    """Return the named PDF engine, or the configured / first available one"""
+    name = (name or PDF_ENGINE).lower()
+    if name == "auto":
+        available = available_pdf_engines()
+        if not available:
+            raise RuntimeError("No PDF engine available. Install PyMuPDF, pdfplumber or PyPDF2 and pdf2image")
+        name = available[0]
+    if name not in PDF_ENGINES:
+        raise ValueError(f"Unknown PDF engine '{name}'. Expected auto, {', '.join(PDF_ENGINES)}")
+    engine_class, available = PDF_ENGINES[name]
+    if not available:
+        raise ValueError(f"PDF engine '{name}' is not installed")
+    return engine_class()
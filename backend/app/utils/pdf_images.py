@@ -0,0 +1,56 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+
+from app.utils.pdf_engines import get_pdf_engine
+
+# Screenshots are taken from the image streams embedded in the PDF, without
+# rendering pages. Images narrower or shorter than these (icons, logos,
+# cursors) are not screenshots and are left out.
+PDF_SCREENSHOT_MIN_WIDTH = int(os.getenv("PDF_SCREENSHOT_MIN_WIDTH", "100"))
+PDF_SCREENSHOT_MIN_HEIGHT = int(os.getenv("PDF_SCREENSHOT_MIN_HEIGHT", "100"))
+
+# Already compressed formats are stored as-is, anything else is deflated
+_STORED_EXTENSIONS = {"jpeg", "jpg", "jpx", "jp2", "png", "webp"}
+
+def extract_screenshots_zip(pdf_path, zip_path, engine=None, log_callback=print):
+    """Write the distinct embedded screenshots of a PDF to a ZIP file.
+
+    Images are written into the archive one at a time as they are extracted,
+    so memory is one image regardless of the document size. The same image
+    repeated on several pages (by object or by content) is written once.
+    Returns counts of images written, duplicates and images too small to keep.
+    """
+    pdf_engine = get_pdf_engine(engine)
+    seen = set()
+    stats = {"image_count": 0, "duplicates": 0, "too_small": 0}
+    images_per_page = {}
+
+    # Write then rename so a concurrent download never gets a partial archive
+    os.makedirs(os.path.dirname(os.path.abspath(zip_path)), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(zip_path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(temp_path, "w") as archive:
+            for page_number, ext, data, width, height in pdf_engine.iter_images(pdf_path):
+                if width < PDF_SCREENSHOT_MIN_WIDTH or height < PDF_SCREENSHOT_MIN_HEIGHT:
+                    stats["too_small"] += 1
+                    continue
+                digest = hashlib.sha256(data).digest()
+                if digest in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(digest)
+                index = images_per_page[page_number] = images_per_page.get(page_number, 0) + 1
+                compression = zipfile.ZIP_STORED if ext in _STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                archive.writestr(f"page_{page_number + 1:03d}_{index}.{ext}", data, compress_type=compression)
+                stats["image_count"] += 1
+        os.replace(temp_path, zip_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    log_callback(f"Extracted {stats['image_count']} screenshots with {pdf_engine.name} "
+                 f"({stats['duplicates']} duplicates, {stats['too_small']} small images skipped)")
+    return stats
@@ -1,133 +1,119 @@
 import os
-from pdf2image import convert_from_path
-from PyPDF2 import PdfReader
-import pytesseract
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from fastapi import HTTPException
+from app.utils.ocr_cache import get_ocr_cache
+from app.utils.ocr_engine import get_ocr_pool, ocr_image
+from app.utils.pdf_engines import get_pdf_engine
+from app.utils.scribe_parser import parse_test_cases
 
-def extract_text_from_pdf(pdf_path, method="native"):
-    """Extract text from PDF using specified method"""
+# Image-only pages are rendered for OCR at this resolution, a few at a time
+# by engines that can render in parallel
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", "200"))
+PDF_RENDER_THREADS = int(os.getenv("PDF_RENDER_THREADS", "4"))
+
+def _iter_rendered_pages(engine, pdf_path, page_numbers):
+    """Render pages and yield the images in page order.
+
+    Engines with parallel_render use a thread pool, rendering at most
+    PDF_RENDER_THREADS pages ahead of the consumer, so memory holds a handful
+    of page images however long the document is. The others hold a process-wide
+    lock while rendering; their pages are rendered one at a time as the
+    consumer asks for them, since extra threads would only queue on that lock.
+    """
+    if not engine.parallel_render:
+        for page_number in page_numbers:
+            yield engine.render_page(pdf_path, page_number, PDF_OCR_DPI)
+        return
+    with ThreadPoolExecutor(max_workers=PDF_RENDER_THREADS, thread_name_prefix="pdf-render") as renderer:
+        pending = deque()
+        try:
+            for page_number in page_numbers:
+                pending.append(renderer.submit(engine.render_page, pdf_path, page_number, PDF_OCR_DPI))
+                if len(pending) >= PDF_RENDER_THREADS:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+def iter_pdf_pages(pdf_path, method="native", workers=None, log_callback=print, engine=None):
+    """Yield (page_number, text) for every page, in page order, as soon as each is ready.
+
+    "native" decides per page: pages with a text layer use it, image-only pages
+    (screenshots) are rendered one by one and OCR'd in the OCR worker
+    processes while later pages are still rendering. "ocr" OCRs every page.
+    engine names one of PDF_ENGINES; by default PDF_ENGINE is used.
+    """
+    if not os.path.exists(pdf_path):
+        raise FileNotFoundError(f"PDF file not found at {pdf_path}")
+
+    pdf_engine = get_pdf_engine(engine)
+    page_texts = None
+    if method == "native":
+        try:
+            page_texts = pdf_engine.page_texts(pdf_path)
+        except Exception as e:
+            log_callback(f"Could not read PDF text layer with {pdf_engine.name}, using OCR for all pages: {str(e)}")
+
+    if page_texts is None:
+        page_texts = [""] * pdf_engine.page_count(pdf_path)
+    ocr_pages = [page_number for page_number, text in enumerate(page_texts) if not text.strip()]
+
+    ocr_texts = iter(())
+    if ocr_pages:
+        log_callback(f"OCR for {len(ocr_pages)} of {len(page_texts)} pages without a text layer "
+                     f"(PDF engine: {pdf_engine.name})")
+        # Lazy: rendering starts when the first image-only page is reached
+        ocr_texts = get_ocr_pool(workers).imap(
+            ocr_image, _iter_rendered_pages(pdf_engine, pdf_path, ocr_pages), cache=get_ocr_cache()
+        )
+    try:
+        for page_number, text in enumerate(page_texts):
+            if not text.strip():
+                text = next(ocr_texts)
+            yield page_number, text
+    finally:
+        if ocr_pages:
+            ocr_texts.close()
+
+def extract_text_from_pdf(pdf_path, method="native", workers=None, log_callback=print, engine=None,
+                          progress_callback=None, by_page=False):
+    """Extract text from PDF using specified method.
+
+    Returns the text lines of all pages in page order, or with by_page=True
+    one text block per non-empty page; see iter_pdf_pages.
+    progress_callback, if given, receives pages_processed after every page.
+    """
     text_data = []
     
     try:
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"PDF file not found at {pdf_path}")
-        
-        if method == "native":
-            try:
-                # Try native PDF text extraction first
-                reader = PdfReader(pdf_path)
-                
-                for page_num, page in enumerate(reader.pages):
-                    text = page.extract_text()
-                    if text.strip():
-                        text_data.extend(text.strip().split('\n'))
-                
-                if not text_data:
-                    method = "ocr"
-                else:
-                    return text_data
-                
-            except Exception as e:
-                method = "ocr"
-        
-        if method == "ocr":
-            try:
-                # Convert PDF to images
-                images = convert_from_path(pdf_path)
-
-                for i, image in enumerate(images):
-                    text = pytesseract.image_to_string(image)
-                    if text.strip():
-                        text_data.extend(text.strip().split('\n'))
-                
-                if not text_data:
-                    return text_data
-                
-            except Exception as e:
-                import traceback
-                print(traceback.format_exc())
-                raise
+        pages = iter_pdf_pages(pdf_path, method, workers, log_callback, engine)
+        for pages_processed, (_, text) in enumerate(pages, 1):
+            if progress_callback:
+                progress_callback(pages_processed=pages_processed)
+            if not text.strip():
+                continue
+            if by_page:
+                text_data.append(text.strip())
+            else:
+                text_data.extend(text.strip().split('\n'))
         
         return text_data
     except Exception as e:
+        import traceback
+        print(traceback.format_exc())
         print(f"Error processing PDF: {str(e)}")
         raise e
 
 async def generate_test_cases(text_data):
     """Generate test cases from extracted text"""
-    print("Received text data:")
-    for line in text_data:
-        print(f"  {line}")
-
     if not text_data:
         print("Warning: Received empty text data")
         return []
-
-    test_cases = []
-    current_scenario = None
-    current_step = None
-    
-    # Find the title/scenario name first
-    for line in text_data:
-        if line.strip() and not line.startswith("Made with Scribe") and "Click" in line:
-            title_index = text_data.index(line) - 1
-            while title_index >= 0:
-                potential_title = text_data[title_index].strip()
-                if potential_title and not potential_title.startswith("Made with") and not potential_title.isdigit():
-                    current_scenario = {
-                        "name": potential_title,
-                        "steps": []
-                    }
-                    print(f"Found scenario: {potential_title}")
-                    break
-                title_index -= 1
-            break
-
-    if not current_scenario:
-        print("No scenario name found")
-        return []
-
-    # Process steps
-    current_step_num = None
-    for line in text_data:
-        line = line.strip()
-        print(f"Processing line: {line}")
-        
-        if not line or line.startswith("Made with Scribe"):
-            continue
-
-        # If line is just a number, it might be a step number
-        if line.isdigit():
-            current_step_num = int(line)
-            continue
-
-        # If we have meaningful text and it's not just a number
-        if line and not line.isdigit() and ("Click" in line or "Navigate" in line):
-            print(f"Found step {current_step_num}: {line}")
-            if current_step:
-                current_scenario["steps"].append(current_step)
-            
-            current_step = {
-                "description": line,
-                "expected_outcome": "Action completed successfully"  # Default outcome
-            }
-            
-        elif line.startswith("Expected Outcome:"):
-            print(f"Found expected outcome: {line}")
-            if current_step:
-                current_step["expected_outcome"] = line.replace("Expected Outcome:", "").strip()
-    
-    if current_step and current_scenario:
-        current_scenario["steps"].append(current_step)
-    
-    test_cases.append(current_scenario)
-    print(f"Final scenario name: {current_scenario['name']}")
-    print(f"Number of steps found: {len(current_scenario['steps'])}")
-    for idx, step in enumerate(current_scenario['steps'], 1):
-        print(f"Step {idx}: {step['description']}")
-    print(f"Generated test cases: {test_cases}")
-    return test_cases
+    return parse_test_cases(text_data)
 
 async def process_test_cases(text_data):
     """Process text data into test cases"""
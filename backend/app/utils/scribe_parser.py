@@ -0,0 +1,155 @@
+import os
+import re
+
+# Scribe guides are a title followed by numbered steps, each a line starting
+# with an action verb ("Click", "Type", ...) and optionally followed by an
+# "Expected Outcome:" line. A document can hold several guides; each restarts
+# its step numbers at 1 (or starts with a "Scenario: <name>" line).
+# OCR'd screens also show bare labels such as "Close", "Enter", "Search..."
+# or "Open Orders". A verb line only counts as a step when it has a step
+# number or bullet, follows a step number line, or names what it acts on.
+DEFAULT_ACTION_VERBS = (
+    "Click", "Double-click", "Right-click", "Navigate", "Go to", "Open", "Close", "Type", "Enter", "Fill",
+    "Select", "Choose", "Check", "Uncheck", "Toggle", "Press", "Scroll", "Hover", "Drag", "Drop", "Upload",
+    "Download", "Search", "Submit", "Switch", "Log in", "Sign in", "Wait", "Verify",
+)
+# Comma separated list replacing the default verbs
+SCRIBE_ACTION_VERBS = [verb.strip() for verb in os.getenv("SCRIBE_ACTION_VERBS", "").split(",") if verb.strip()]
+
+DEFAULT_EXPECTED_OUTCOME = "Action completed successfully"
+
+_FOOTER_PREFIX = "Made with"
+_LINE_PATTERNS = (
+    r"(?P<number>\d+)$",
+    r"(?:(?:expected|received)\s+(?:outcome|result)|expected)\s*:\s*(?P<outcome>.*)$",
+    r"(?:scenario|test\s+case)(?:\s+name)?\s*[:\-]\s*(?P<header>.+)$",
+)
+# What an unnumbered action must name after its verb: a quoted target, a URL,
+# a number or a phrase such as "on the ...", "into ...", "down"
+_OBJECT = re.compile(r"\s*(?:[\"“”'‘’«\[(]|https?://|\d|(?:on|in|into|to|onto|the|a|an|at|from|for|with|of|"
+                     r"by|under|over|down|up|back|here|this|that|your|my)\b)", re.IGNORECASE)
+
+class ScribeParser:
+    """Single-pass parser turning Scribe text lines into test case scenarios"""
+
+    def __init__(self, verbs=None, numbered_steps=False):
+        """numbered_steps also takes "3. <anything>" lines as steps, for test cases written as numbered lists"""
+        verbs = verbs or SCRIBE_ACTION_VERBS or DEFAULT_ACTION_VERBS
+        # Longest first so "Double-click" wins over "Click"; an optional step
+        # number or bullet may precede the verb on the same line
+        alternatives = "|".join(re.escape(verb).replace(r"\ ", r"\s+")
+                                for verb in sorted(verbs, key=len, reverse=True))
+        verbs = rf"(?:{alternatives})\b"
+        patterns = _LINE_PATTERNS + (
+            rf"(?:(?P<step_number>\d+)[.)]?\s+|[-*•]\s*)(?P<action>{verbs}.*)",
+            rf"(?P<bare_action>{verbs}(?P<bare_object>.*))",
+        )
+        if numbered_steps:
+            patterns += (r"(?P<listed_number>\d+)[.)]\s+(?P<listed>.+)",)
+        # One match per line classifies it; lines matching nothing are screen text or titles
+        self._line = re.compile("|".join(patterns), re.IGNORECASE)
+
+    def _classify(self, line, after_number=False):
+        """(kind, match) of a line; kind is None for screen text and titles"""
+        match = self._line.match(line)
+        if match is None:
+            return None, None
+        kind = match.lastgroup
+        if kind == "bare_action" and not after_number and not _OBJECT.match(match.group("bare_object")):
+            return None, match  # a UI label that happens to start with a verb
+        return kind, match
+
+    def is_test_content(self, line):
+        """True for steps, expected outcomes and scenario headers"""
+        return self._classify(line)[0] in ("action", "bare_action", "listed", "outcome", "header")
+
+    def iter_test_cases(self, text_data):
+        """Yield each scenario ({"name", "steps"}) as soon as its last step has been read.
+
+        text_data is any iterable of text; entries holding several lines (OCR
+        blocks) are split. Steps before any title line go into "Scenario 1".
+        """
+        scenario = None
+        step = None
+        title = None           # last line since the previous step that could name a scenario
+        last_number = 0        # last step number seen
+        restart = False        # step numbering went back to 1: the next step starts a scenario
+        after_number = False   # the previous line was a bare step number
+        count = 0
+
+        for block in text_data:
+            for line in block.splitlines():
+                line = line.strip()
+                if not line or line.startswith(_FOOTER_PREFIX):
+                    continue
+
+                kind, match = self._classify(line, after_number)
+                after_number = kind == "number"
+                if kind is None:
+                    title = line
+                    restart = False
+                    continue
+
+                if kind == "number":
+                    number = int(line)
+                    restart = number == 1 and last_number > 1
+                    last_number = number
+                    continue
+
+                if kind == "outcome":
+                    if step is not None:
+                        step["expected_outcome"] = match.group("outcome").strip()
+                    restart = False
+                    continue
+
+                number = match.group("listed_number") if kind == "listed" else match.group("step_number")
+                if kind != "header" and number:
+                    # Step number on the same line as the action
+                    number = int(number)
+                    restart = restart or (number == 1 and last_number > 1)
+                    last_number = number
+
+                if kind == "header" or restart or scenario is None:
+                    if scenario is not None:
+                        if step is not None:
+                            scenario["steps"].append(step)
+                        yield scenario
+                    count += 1
+                    if kind == "header":
+                        name = match.group("header").strip()
+                    else:
+                        name = title or f"Scenario {count}"
+                    scenario = {"name": name, "steps": []}
+                    step = None
+                    title = None
+                    restart = False
+                    if kind == "header":
+                        last_number = 0
+                        continue
+
+                if step is not None:
+                    scenario["steps"].append(step)
+                step = {"description": match.group(kind), "expected_outcome": DEFAULT_EXPECTED_OUTCOME}
+                title = None
+
+        if scenario is not None:
+            if step is not None:
+                scenario["steps"].append(step)
+            yield scenario
+
+scribe_parser = ScribeParser()
+
+def iter_test_cases(text_data, verbs=None):
+    """Yield test case scenarios parsed from text_data (see ScribeParser.iter_test_cases)"""
+    parser = ScribeParser(verbs) if verbs else scribe_parser
+    return parser.iter_test_cases(text_data)
+
+def parse_test_cases(text_data, verbs=None, log_callback=print):
+    """Parse text_data into a list of test case scenarios"""
+    test_cases = list(iter_test_cases(text_data, verbs))
+    if not test_cases:
+        log_callback("No test steps found in the extracted text")
+    else:
+        log_callback(f"Parsed {len(test_cases)} scenarios with "
+                     f"{sum(len(test_case['steps']) for test_case in test_cases)} steps")
+    return test_cases
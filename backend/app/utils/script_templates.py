@@ -0,0 +1,441 @@
+import re
+
+from app.utils.scribe_parser import DEFAULT_EXPECTED_OUTCOME, ScribeParser
+
+# Scribe steps are regular ("Click "Save"", "Navigate to https://...",
+# "Type "jane@example.com" into "Email""), so most of them map straight to
+# framework code. Steps no template matches are sent to the LLM together in
+# one request; everything else is generated locally.
+FRAMEWORK_ALIASES = {
+    "selenium": "selenium",
+    "sahi": "sahi",
+    "sahi pro": "sahi",
+    "gherkin": "gherkin",
+    "cucumber": "gherkin",
+}
+FRAMEWORK_LABELS = {
+    "selenium": "Selenium Java (JUnit 5)",
+    "sahi": "SAHI Pro",
+    "gherkin": "Gherkin",
+}
+
+_QUOTED = re.compile(r'["“”]([^"“”]+)["“”]')
+_URL = re.compile(r"^(?:https?://|www\.)\S+$|^[\w-]+(?:\.[\w-]+)+(?:/\S*)?$", re.IGNORECASE)
+_LEADING_FILLER = re.compile(r"^(?:on|in|into|the|a|an)\s+", re.IGNORECASE)
+_TRAILING_KIND = re.compile(r"\s+(?:button|link|tab|icon|field|box|option|menu|item|checkbox)$", re.IGNORECASE)
+# Unquoted targets longer than this are sentences, not element labels
+_MAX_TARGET_WORDS = 5
+_VAGUE_TARGETS = {"here", "this", "it", "there", "anywhere"}
+# "Check" is also "make sure": only a quoted label or a box is a checkbox
+_CHECKBOX_NOUN = re.compile(r"\b(?:check)?box$", re.IGNORECASE)
+# Unquoted field of a typing step: Enter "x" in the Email field
+_FIELD_PHRASE = re.compile(r"\b(?:in|into|on)\s+(?:the\s+)?(?P<field>[^\"“”]+?)\s+"
+                           r"(?:field|box|input|textbox|text\s+box|textarea)\b", re.IGNORECASE)
+# Sections of LLM-written test cases (ChatGPTHelper.generate_test_cases) that
+# hold numbered lists but no steps; they run until the next scenario header
+_NON_STEP_SECTION = re.compile(r"^\s*(?:regression\s+scenarios|notes|pre-?required\s+conditions|"
+                               r"browser\s+configuration)\s*:", re.IGNORECASE)
+_SCENARIO_HEADER = re.compile(r"^\s*(?:scenario|test\s+case)(?:\s+name)?\s*[:\-]", re.IGNORECASE)
+# Fill in the Email field with "x"
+_FILL_FIELD = re.compile(r"^(?:the\s+)?(?P<field>[^\"“”]+?)(?:\s+(?:field|box|input|textbox|text\s+box))?\s+with\b",
+                         re.IGNORECASE)
+
+# LLM answers for Gherkin steps may repeat the step keyword
+_GHERKIN_KEYWORD = re.compile(r"^(?:given|when|then|and|but)\s+", re.IGNORECASE)
+
+_KEYS = {"enter": "ENTER", "return": "ENTER", "tab": "TAB", "escape": "ESCAPE", "esc": "ESCAPE",
+         "backspace": "BACK_SPACE", "delete": "DELETE", "space": "SPACE", "up": "ARROW_UP", "down": "ARROW_DOWN"}
+
+_ACTION_RULES = [
+    ("navigate", re.compile(r"^(?:navigate|go)\s+to\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("navigate", re.compile(r"^open\s+(?P<rest>\S+)$", re.IGNORECASE)),
+    ("double_click", re.compile(r"^double[\s-]click\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("right_click", re.compile(r"^right[\s-]click\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("click", re.compile(r"^click\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("type", re.compile(r"^(?:type|enter)\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("fill", re.compile(r"^fill\s+(?:in\s+)?(?P<rest>.+)$", re.IGNORECASE)),
+    ("select", re.compile(r"^(?:select|choose)\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("check", re.compile(r"^check\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("uncheck", re.compile(r"^uncheck\s+(?P<rest>.+)$", re.IGNORECASE)),
+    ("press", re.compile(r"^press\s+(?:the\s+)?(?P<rest>\w+)(?:\s+key)?\.?$", re.IGNORECASE)),
+    ("hover", re.compile(r"^hover\s+(?:over\s+|on\s+)?(?P<rest>.+)$", re.IGNORECASE)),
+    ("scroll", re.compile(r"^scroll\s*(?P<rest>.*)$", re.IGNORECASE)),
+    ("wait", re.compile(r"^wait\s+(?:for\s+)?(?P<rest>\d+(?:\.\d+)?)\s*(?:s|sec|secs|seconds?)\.?$", re.IGNORECASE)),
+    ("verify", re.compile(r"^verify\s+(?:that\s+)?(?P<rest>.+)$", re.IGNORECASE)),
+]
+
+def _target(text):
+    """Element label of a step: the quoted text, else a short unquoted phrase"""
+    quoted = _QUOTED.findall(text)
+    if quoted:
+        return quoted[0].strip()
+    text = _LEADING_FILLER.sub("", text.strip().rstrip(".")).strip()
+    text = _LEADING_FILLER.sub("", text)
+    text = _TRAILING_KIND.sub("", text).strip()
+    if not text or text.lower() in _VAGUE_TARGETS or len(text.split()) > _MAX_TARGET_WORDS:
+        return None
+    return text
+
+def parse_action(description):
+    """Map a step description to (action, args), or None when no template applies"""
+    description = description.strip()
+    for action, pattern in _ACTION_RULES:
+        match = pattern.match(description)
+        if not match:
+            continue
+        rest = match.group("rest").strip()
+        quoted = _QUOTED.findall(rest)
+        if action == "navigate":
+            url = quoted[0] if quoted else rest.rstrip(".")
+            if _URL.match(url):
+                return "navigate", {"url": url if "://" in url else f"https://{url}"}
+            # "Navigate to Settings" is a click on a menu entry
+            target = _target(rest)
+            return ("click", {"target": target}) if target else None
+        if action in ("type", "fill"):
+            if action == "fill" and len(quoted) >= 2:
+                # Fill "Email" with "jane@example.com"
+                return "type", {"text": quoted[1], "field": quoted[0]}
+            if not quoted:
+                return None
+            if len(quoted) > 1:
+                # Type "jane@example.com" into "Email"
+                return "type", {"text": quoted[0], "field": quoted[1]}
+            # Type "jane@example.com" into the Email field / Fill in the Email field with "..."
+            phrase = _FILL_FIELD.match(rest) if action == "fill" else _FIELD_PHRASE.search(rest)
+            field = phrase.group("field").strip() if phrase else None
+            if field and (field.lower() in _VAGUE_TARGETS or len(field.split()) > _MAX_TARGET_WORDS):
+                field = None
+            return "type", {"text": quoted[0], "field": field}
+        if action == "select":
+            if len(quoted) >= 2:
+                return "select", {"option": quoted[0], "field": quoted[1]}
+            target = _target(rest)
+            # Picking an entry of a custom dropdown is recorded as "Select "X""
+            return ("click", {"target": target}) if target else None
+        if action == "press":
+            key = _KEYS.get(rest.lower())
+            return ("press", {"key": key, "label": rest}) if key else None
+        if action == "scroll":
+            return "scroll", {"direction": "up" if rest.lower().startswith("up") else "down"}
+        if action == "wait":
+            return "wait", {"seconds": float(rest)}
+        if action == "verify":
+            text = quoted[0] if quoted else None
+            return ("verify", {"text": text}) if text else None
+        if action == "check" and not quoted and not _CHECKBOX_NOUN.search(rest.rstrip(".")):
+            # "Check login with wrong password" is a test, not a checkbox
+            return None
+        target = _target(rest)
+        return (action, {"target": target}) if target else None
+    return None
+
+def _java_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _xpath_literal(value):
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+def _text_xpath(label):
+    """Element whose own text, value or accessible name is label"""
+    literal = _xpath_literal(label)
+    return (f"//*[normalize-space(text())={literal} or @value={literal} or @aria-label={literal} "
+            f"or @title={literal}]")
+
+def _field_xpath(label):
+    """Input or textarea identified by its label, placeholder, name or accessible name"""
+    literal = _xpath_literal(label)
+    return (f"//*[self::input or self::textarea or self::select][@placeholder={literal} or @name={literal} "
+            f"or @aria-label={literal} or @id=//label[normalize-space()={literal}]/@for]")
+
+def _checkbox_xpath(label):
+    literal = _xpath_literal(label)
+    return (f"//input[@type='checkbox'][@name={literal} or @aria-label={literal} "
+            f"or @id=//label[normalize-space()={literal}]/@for] | //label[normalize-space()={literal}]//input")
+
+def _selenium_step(action, args):
+    if action == "navigate":
+        return [f"driver.get({_java_string(args['url'])});"]
+    if action in ("check", "uncheck"):
+        locator = f"By.xpath({_java_string(_checkbox_xpath(args['target']))})"
+        return [f"setChecked({locator}, {'true' if action == 'check' else 'false'});"]
+    if action in ("click", "double_click", "right_click", "hover"):
+        locator = f"By.xpath({_java_string(_text_xpath(args['target']))})"
+        element = f"wait.until(ExpectedConditions.elementToBeClickable({locator}))"
+        if action == "click":
+            return [f"{element}.click();"]
+        if action == "double_click":
+            return [f"new Actions(driver).doubleClick({element}).perform();"]
+        if action == "right_click":
+            return [f"new Actions(driver).contextClick({element}).perform();"]
+        return [f"new Actions(driver).moveToElement({element}).perform();"]
+    if action == "type":
+        if args["field"]:
+            locator = f"By.xpath({_java_string(_field_xpath(args['field']))})"
+            return [f"typeInto({locator}, {_java_string(args['text'])});"]
+        return [f"driver.switchTo().activeElement().sendKeys({_java_string(args['text'])});"]
+    if action == "select":
+        locator = f"By.xpath({_java_string(_field_xpath(args['field']))})"
+        return [f"new Select(driver.findElement({locator})).selectByVisibleText({_java_string(args['option'])});"]
+    if action == "press":
+        return [f"driver.switchTo().activeElement().sendKeys(Keys.{args['key']});"]
+    if action == "scroll":
+        amount = "-600" if args["direction"] == "up" else "600"
+        return [f"((JavascriptExecutor) driver).executeScript(\"window.scrollBy(0, {amount});\");"]
+    if action == "wait":
+        return [f"Thread.sleep({int(args['seconds'] * 1000)});"]
+    if action == "verify":
+        return [f"assertTrue(driver.getPageSource().contains({_java_string(args['text'])}));"]
+    return None
+
+def _sahi_step(action, args):
+    if action == "navigate":
+        return [f"_navigateTo({_java_string(args['url'])});"]
+    if action in ("click", "double_click", "right_click", "hover"):
+        element = f"_byXPath({_java_string(_text_xpath(args['target']))})"
+        command = {"click": "_click", "double_click": "_doubleClick", "right_click": "_rightClick",
+                   "hover": "_mouseOver"}[action]
+        return [f"{command}({element});"]
+    if action in ("check", "uncheck"):
+        return [f"_{action}(_checkbox({_java_string(args['target'])}));"]
+    if action == "type":
+        if not args["field"]:
+            return None
+        element = f"_byXPath({_java_string(_field_xpath(args['field']))})"
+        return [f"_setValue({element}, {_java_string(args['text'])});"]
+    if action == "select":
+        element = f"_byXPath({_java_string(_field_xpath(args['field']))})"
+        return [f"_setSelected({element}, {_java_string(args['option'])});"]
+    if action == "scroll":
+        return ["// Sahi scrolls elements into view before acting on them"]
+    if action == "wait":
+        return [f"_wait({int(args['seconds'] * 1000)});"]
+    if action == "verify":
+        return [f"_assertExists(_byXPath({_java_string(_text_xpath(args['text']))}));"]
+    return None
+
+def _gherkin_phrase(action, args):
+    if action == "navigate":
+        return f'I navigate to "{args["url"]}"'
+    if action in ("click", "double_click", "right_click", "hover", "check", "uncheck"):
+        verb = {"click": "click", "double_click": "double-click", "right_click": "right-click",
+                "hover": "hover over", "check": "check", "uncheck": "uncheck"}[action]
+        return f'I {verb} "{args["target"]}"'
+    if action == "type":
+        if args["field"]:
+            return f'I enter "{args["text"]}" into "{args["field"]}"'
+        return f'I type "{args["text"]}"'
+    if action == "select":
+        return f'I select "{args["option"]}" from "{args["field"]}"'
+    if action == "press":
+        return f'I press "{args["label"]}"'
+    if action == "scroll":
+        return f"I scroll {args['direction']}"
+    if action == "wait":
+        return f"I wait {args['seconds']:g} seconds"
+    if action == "verify":
+        return f'I should see "{args["text"]}"'
+    return None
+
+def _method_name(name, used):
+    words = re.findall(r"[A-Za-z0-9]+", name) or ["scenario"]
+    method = words[0].lower() + "".join(word.capitalize() for word in words[1:])
+    if method[0].isdigit():
+        method = f"scenario{method[0].upper()}{method[1:]}"
+    candidate, index = method, 2
+    while candidate in used:
+        candidate, index = f"{method}{index}", index + 1
+    used.add(candidate)
+    return candidate
+
+def parse_script_steps(test_case):
+    """Scenarios of a test case given as parser output (a list) or as text (numbered steps, Scribe text)"""
+    if isinstance(test_case, list):
+        return [scenario for scenario in test_case if isinstance(scenario, dict) and scenario.get("steps")]
+    scenarios = ScribeParser(numbered_steps=True).iter_test_cases(_step_lines(test_case))
+    return [scenario for scenario in scenarios if scenario["steps"]]
+
+def _step_lines(text):
+    """Lines of a test case text without its regression, notes and setup sections"""
+    skipping = False
+    for line in text.splitlines():
+        if _NON_STEP_SECTION.match(line):
+            skipping = True
+        elif skipping and _SCENARIO_HEADER.match(line):
+            skipping = False
+        if not skipping:
+            yield line
+
+async def _llm_snippets(framework, steps, llm, log_callback):
+    """Ask the LLM for code of the given (number, description) steps in one request"""
+    label = FRAMEWORK_LABELS[framework]
+    listing = "\n".join(f"{number}. {description}" for number, description in steps)
+    prompt = f"""
+    Write {label} code for each of the following UI test steps. The browser session is
+    already open (Selenium: `driver` and a 10 second WebDriverWait `wait`).
+    Reply with one block per step, in order. Start each block with a line `### STEP <number>`
+    followed only by the code statements for that step: no imports, no class or function,
+    no explanations, no markdown fences.
+
+    {listing}
+    """
+    try:
+        response = await llm(prompt) or ""
+    except Exception as e:
+        log_callback(f"LLM fallback for {len(steps)} steps failed: {str(e)}")
+        return {}
+    snippets = {}
+    for number, body in re.findall(r"^###\s*STEP\s+(\d+)\s*\n(.*?)(?=^###\s*STEP|\Z)", response, re.M | re.S):
+        lines = [line.rstrip() for line in body.strip().splitlines() if not line.strip().startswith("```")]
+        if lines:
+            snippets[int(number)] = lines
+    return snippets
+
+async def generate_script(scenarios, framework, llm=None, log_callback=print):
+    """Render scenarios as a Selenium, SAHI Pro or Gherkin script from templates.
+
+    Steps no template covers are sent to llm (an async prompt -> text
+    callable) in a single request; without llm, or if it fails, they are
+    left as TODO comments (in Gherkin, which is prose, as the recorded wording). Returns the script and counts of template, LLM and TODO steps.
+    """
+    framework = FRAMEWORK_ALIASES.get(framework.strip().lower())
+    if framework is None:
+        raise ValueError(f"No templates for this framework. Expected one of: {', '.join(FRAMEWORK_ALIASES)}")
+
+    # Number every step once so LLM answers can be matched back
+    rendered = []
+    unmapped = []
+    number = 0
+    for scenario in scenarios:
+        steps = []
+        for step in scenario["steps"]:
+            number += 1
+            description = step["description"].strip()
+            parsed = parse_action(description)
+            if framework == "gherkin":
+                code = _gherkin_phrase(*(parsed or (None, None)))
+            elif parsed is None:
+                code = None
+            else:
+                code = (_selenium_step if framework == "selenium" else _sahi_step)(*parsed)
+            if code is None:
+                unmapped.append((number, description))
+            steps.append((number, description, step.get("expected_outcome"), code))
+        rendered.append((scenario.get("name") or "Recorded scenario", steps))
+
+    snippets = {}
+    if unmapped and llm is not None:
+        log_callback(f"{len(unmapped)} of {number} steps have no template, asking the LLM")
+        snippets = await _llm_snippets(framework, unmapped, llm, log_callback)
+
+    stats = {"steps": number, "template_steps": number - len(unmapped),
+             "llm_steps": sum(1 for step_number, _ in unmapped if step_number in snippets),
+             "todo_steps": sum(1 for step_number, _ in unmapped if step_number not in snippets)}
+    render = {"selenium": _render_selenium, "sahi": _render_sahi, "gherkin": _render_gherkin}[framework]
+    return {"script": render(rendered, snippets), **stats}
+
+def _step_code(number, description, code, snippets, comment):
+    if code is not None:
+        return code
+    if number in snippets:
+        return snippets[number]
+    return [f"{comment} TODO: {description}"]
+
+def _outcome_comment(outcome, comment):
+    if outcome and outcome != DEFAULT_EXPECTED_OUTCOME:
+        return [f"{comment} Expected: {outcome}"]
+    return []
+
+def _render_selenium(rendered, snippets):
+    lines = [
+        "import org.openqa.selenium.By;",
+        "import org.openqa.selenium.JavascriptExecutor;",
+        "import org.openqa.selenium.Keys;",
+        "import org.openqa.selenium.WebDriver;",
+        "import org.openqa.selenium.WebElement;",
+        "import org.openqa.selenium.chrome.ChromeDriver;",
+        "import org.openqa.selenium.interactions.Actions;",
+        "import org.openqa.selenium.support.ui.ExpectedConditions;",
+        "import org.openqa.selenium.support.ui.Select;",
+        "import org.openqa.selenium.support.ui.WebDriverWait;",
+        "import org.junit.jupiter.api.AfterEach;",
+        "import org.junit.jupiter.api.BeforeEach;",
+        "import org.junit.jupiter.api.Test;",
+        "",
+        "import java.time.Duration;",
+        "",
+        "import static org.junit.jupiter.api.Assertions.assertTrue;",
+        "",
+        "public class ScribeRecordedTest {",
+        "    private WebDriver driver;",
+        "    private WebDriverWait wait;",
+        "",
+        "    @BeforeEach",
+        "    void setUp() {",
+        "        driver = new ChromeDriver();",
+        "        wait = new WebDriverWait(driver, Duration.ofSeconds(10));",
+        "    }",
+        "",
+        "    @AfterEach",
+        "    void tearDown() {",
+        "        driver.quit();",
+        "    }",
+        "",
+        "    private void typeInto(By locator, String text) {",
+        "        WebElement field = wait.until(ExpectedConditions.visibilityOfElementLocated(locator));",
+        "        field.clear();",
+        "        field.sendKeys(text);",
+        "    }",
+        "",
+        "    private void setChecked(By locator, boolean checked) {",
+        "        WebElement checkbox = wait.until(ExpectedConditions.presenceOfElementLocated(locator));",
+        "        if (checkbox.isSelected() != checked) {",
+        "            checkbox.click();",
+        "        }",
+        "    }",
+    ]
+    used = set()
+    for name, steps in rendered:
+        lines += ["", f"    // Scenario: {name}", "    @Test", f"    void {_method_name(name, used)}() throws Exception {{"]
+        for number, description, outcome, code in steps:
+            lines.append(f"        // Step {number}: {description}")
+            lines += [f"        {line}" for line in _step_code(number, description, code, snippets, "//")]
+            lines += [f"        {line}" for line in _outcome_comment(outcome, "//")]
+        lines.append("    }")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def _render_sahi(rendered, snippets):
+    lines = []
+    used = set()
+    calls = []
+    for name, steps in rendered:
+        function = _method_name(name, used)
+        calls.append(f"{function}();")
+        lines += [f"// Scenario: {name}", f"function {function}() {{"]
+        for number, description, outcome, code in steps:
+            lines.append(f"    // Step {number}: {description}")
+            lines += [f"    {line}" for line in _step_code(number, description, code, snippets, "//")]
+            lines += [f"    {line}" for line in _outcome_comment(outcome, "//")]
+        lines += ["}", ""]
+    return "\n".join(lines + calls) + "\n"
+
+def _render_gherkin(rendered, snippets):
+    feature = rendered[0][0] if len(rendered) == 1 else "Recorded user flows"
+    lines = [f"Feature: {feature}"]
+    for name, steps in rendered:
+        lines += ["", f"  Scenario: {name}"]
+        previous = None
+        for index, (number, description, outcome, code) in enumerate(steps):
+            if code is None:
+                code = _GHERKIN_KEYWORD.sub("", " ".join(snippets.get(number, [description])).strip())
+            keyword = "Given" if index == 0 else ("Then" if code.startswith("I should see") else "When")
+            lines.append(f"    {'And' if keyword == previous else keyword} {code}")
+            previous = keyword
+            if outcome and outcome != DEFAULT_EXPECTED_OUTCOME:
+                lines.append(f"    {'And' if previous == 'Then' else 'Then'} {outcome}")
+                previous = "Then"
+    return "\n".join(lines) + "\n"
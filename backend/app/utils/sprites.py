@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+
+from app.utils.thumbnails import THUMBNAIL_FORMATS
+
+# Frames are packed into grids of SPRITE_COLUMNS x SPRITE_ROWS tiles, so a
+# gallery of hundreds of frames needs a few image requests instead of one
+# per frame. Offsets of every frame are listed in index.json next to the sheets.
+SPRITE_TILE_WIDTHS = (120, 160, 240, 320)
+DEFAULT_SPRITE_TILE_WIDTH = 160
+SPRITE_COLUMNS = 10
+SPRITE_ROWS = 10
+SPRITE_FORMAT = "webp"
+SPRITE_INDEX_FILE = "index.json"
+SPRITE_BACKGROUND = 255
+
+# Sheets are built rarely, once per job and tile width; one lock keeps two
+# requests for the same gallery from building it twice
+_build_lock = threading.Lock()
+
+def _tile(frame_path, tile_width, tile_height):
+    """Frame scaled to fit the tile and centred on a white background"""
+    tile = np.full((tile_height, tile_width, 3), SPRITE_BACKGROUND, dtype=np.uint8)
+    image = cv2.imread(frame_path, cv2.IMREAD_COLOR)
+    if image is None:
+        return tile
+    height, width = image.shape[:2]
+    scale = min(tile_width / float(width), tile_height / float(height))
+    scaled = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                        interpolation=cv2.INTER_AREA)
+    top = (tile_height - scaled.shape[0]) // 2
+    left = (tile_width - scaled.shape[1]) // 2
+    tile[top:top + scaled.shape[0], left:left + scaled.shape[1]] = scaled
+    return tile
+
+def _write_atomic(path, data):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def build_sprite_sheets(frame_paths, output_folder, tile_width=DEFAULT_SPRITE_TILE_WIDTH, log_callback=print):
+    """Pack frames into sprite sheets in output_folder and return the index.
+
+    The index lists the sheets and, for every frame in order, the sheet it is
+    on and its tile rectangle. Frames are read one at a time, so memory is one
+    sheet regardless of the number of frames.
+    """
+    if tile_width not in SPRITE_TILE_WIDTHS:
+        raise ValueError(f"Unsupported tile width {tile_width}. Expected one of: "
+                         f"{', '.join(str(w) for w in SPRITE_TILE_WIDTHS)}")
+    os.makedirs(output_folder, exist_ok=True)
+
+    # All frames of a video share one size; the first one sets the tile shape
+    first = cv2.imread(frame_paths[0], cv2.IMREAD_COLOR) if frame_paths else None
+    aspect = first.shape[0] / float(first.shape[1]) if first is not None else 9 / 16.0
+    tile_height = max(1, int(round(tile_width * aspect)))
+    per_sheet = SPRITE_COLUMNS * SPRITE_ROWS
+    _, params = THUMBNAIL_FORMATS[SPRITE_FORMAT]
+
+    sheets = []
+    frames = []
+    for sheet_index, offset in enumerate(range(0, len(frame_paths), per_sheet)):
+        batch = frame_paths[offset:offset + per_sheet]
+        rows = (len(batch) + SPRITE_COLUMNS - 1) // SPRITE_COLUMNS
+        columns = min(len(batch), SPRITE_COLUMNS)
+        sheet = np.full((rows * tile_height, columns * tile_width, 3), SPRITE_BACKGROUND, dtype=np.uint8)
+        for position, frame_path in enumerate(batch):
+            x = (position % SPRITE_COLUMNS) * tile_width
+            y = (position // SPRITE_COLUMNS) * tile_height
+            sheet[y:y + tile_height, x:x + tile_width] = _tile(frame_path, tile_width, tile_height)
+            frames.append({"frame": frame_path, "sheet": sheet_index, "x": x, "y": y,
+                           "width": tile_width, "height": tile_height})
+
+        ok, encoded = cv2.imencode(f".{SPRITE_FORMAT}", sheet, params)
+        if not ok:
+            raise ValueError(f"Could not encode sprite sheet {sheet_index}")
+        name = f"sprite_{sheet_index}.{SPRITE_FORMAT}"
+        _write_atomic(os.path.join(output_folder, name), encoded.tobytes())
+        sheets.append({"file": name, "width": sheet.shape[1], "height": sheet.shape[0]})
+
+    index = {
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "columns": SPRITE_COLUMNS,
+        "rows": SPRITE_ROWS,
+        "sheets": sheets,
+        "frames": frames
+    }
+    # The index is written last: its presence means the sheets are complete
+    _write_atomic(os.path.join(output_folder, SPRITE_INDEX_FILE), json.dumps(index).encode("utf-8"))
+    log_callback(f"Built {len(sheets)} sprite sheets for {len(frame_paths)} frames in {output_folder}")
+    return index
+
+def _load_index(index_path):
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def get_sprite_sheets(frame_paths, output_folder, tile_width=DEFAULT_SPRITE_TILE_WIDTH, log_callback=print):
+    """Return the sprite index for output_folder, building the sheets on first use"""
+    index_path = os.path.join(output_folder, SPRITE_INDEX_FILE)
+    index = _load_index(index_path)
+    if index is not None:
+        return index
+    with _build_lock:
+        index = _load_index(index_path)
+        if index is None:
+            index = build_sprite_sheets(frame_paths, output_folder, tile_width, log_callback)
+        return index
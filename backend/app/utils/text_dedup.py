@@ -0,0 +1,222 @@
+import os
+import re
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from app.utils.scribe_parser import scribe_parser
+
+# Consecutive video frames (and repeated PDF headers and footers) give the
+# same lines over and over, often with small OCR differences. Lines are
+# compared as sets of character shingles; MinHash signatures bucketed by
+# band (LSH) find candidate near-duplicates without comparing every pair.
+# Candidates must then differ only by OCR-sized slips within words, so
+# "Click the user form" and "Click the order form" or two order numbers
+# stay apart. Lines are only remembered for a window of recent blocks (pages
+# or frames), and lines that may be test content are always kept: short
+# lines, step numbers, action steps and lines quoting a target (a guide
+# that clicks "Save" twice has two steps).
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+TEXT_DEDUP_ENABLED = os.getenv("TEXT_DEDUP_ENABLED", "true").lower() in ("1", "true", "yes")
+# Jaccard similarity of shingle sets from which two lines can be the same
+TEXT_DEDUP_THRESHOLD = float(os.getenv("TEXT_DEDUP_THRESHOLD", "0.5"))
+# Blocks (frames) a line is remembered for after it was last seen; lines
+# that come back later (a repeated step) are kept
+TEXT_DEDUP_WINDOW = int(os.getenv("TEXT_DEDUP_WINDOW", "10"))
+
+SHINGLE_SIZE = 3
+# 16 bands of 2 rows: pairs from about 0.25 similarity up become candidates,
+# the exact Jaccard check then applies the threshold
+MINHASH_BANDS = 16
+MINHASH_ROWS = 2
+# Shorter lines (step numbers, labels, single words) are never removed
+MIN_FUZZY_LENGTH = 12
+# Edits allowed per word (at least one); numbers must match exactly
+WORD_EDIT_RATIO = 0.25
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+_NORMALIZE = re.compile(r"[^\w]+")
+# "3", "Step 3", "3." and "3. Click ..." lines
+_STEP_MARKER = re.compile(r"^\s*(?:step\s*)?\d+\s*(?:[.):]|$)", re.IGNORECASE)
+_QUOTED_TARGET = re.compile(r'"[^"]+"|“[^”]+”|‘[^’]+’')
+
+def count_tokens(text):
+    """LLM tokens in text (tiktoken when installed, else about four characters per token)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
+
+def normalize_line(line):
+    """Comparison key of a line: lower case, punctuation and spacing collapsed"""
+    return _NORMALIZE.sub(" ", line.casefold()).strip()
+
+def is_protected(line):
+    """Lines that are kept even when repeated: they may be test steps, outcomes or scenario headers"""
+    return (len(normalize_line(line)) < MIN_FUZZY_LENGTH or _STEP_MARKER.match(line) is not None
+            or _QUOTED_TARGET.search(line) is not None or scribe_parser.is_test_content(line.strip()))
+
+def _edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def _is_number(word):
+    """Numbers and IDs, as opposed to words with a misread letter ("Sett1ngs")"""
+    return sum(char.isdigit() for char in word) * 2 >= len(word)
+
+def _ocr_variants(key, other):
+    """True when two normalized lines differ only by small misreadings within words"""
+    words, other_words = key.split(), other.split()
+    if len(words) != len(other_words):
+        return False
+    for word, other_word in zip(words, other_words):
+        if word == other_word:
+            continue
+        if _is_number(word) or _is_number(other_word):
+            return False
+        if _edit_distance(word, other_word) > max(1, int(max(len(word), len(other_word)) * WORD_EDIT_RATIO)):
+            return False
+    return True
+
+def _shingles(key):
+    return {zlib.crc32(key[i:i + SHINGLE_SIZE].encode("utf-8")) for i in range(len(key) - SHINGLE_SIZE + 1)}
+
+def _band_keys(shingles, numbers):
+    """LSH bucket keys; numbers must match exactly, so they are part of every key"""
+    hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+    # (a * x + b) mod p for every permutation; uint64 wraps instead of
+    # overflowing, which only reshuffles the permutation
+    signature = ((np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+    return [(band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS].tobytes(), numbers)
+            for band in range(MINHASH_BANDS)]
+
+class TextDeduplicator:
+    """Drops lines that repeat, exactly or nearly, a line seen in the last `window` blocks"""
+
+    def __init__(self, threshold=TEXT_DEDUP_THRESHOLD, window=TEXT_DEDUP_WINDOW):
+        self.threshold = threshold
+        self.window = window  # None remembers every line
+        self._block = 0
+        self._exact = OrderedDict()      # key -> block last seen
+        self._entries = OrderedDict()    # entry id -> (key, shingles, band keys, block last seen)
+        self._buckets = {}               # band key -> set of entry ids
+        self._next_id = 0
+        self.stats = {"lines_in": 0, "lines_out": 0, "exact_duplicates": 0, "near_duplicates": 0,
+                      "protected": 0, "chars_in": 0, "chars_out": 0}
+
+    def _expire(self):
+        if self.window is None:
+            return
+        oldest = self._block - self.window
+        while self._exact and next(iter(self._exact.values())) < oldest:
+            self._exact.popitem(last=False)
+        while self._entries:
+            entry_id, (_, _, band_keys, last_seen) = next(iter(self._entries.items()))
+            if last_seen >= oldest:
+                break
+            self._entries.popitem(last=False)
+            for band_key in band_keys:
+                bucket = self._buckets.get(band_key)
+                if bucket is not None:
+                    bucket.discard(entry_id)
+                    if not bucket:
+                        del self._buckets[band_key]
+
+    def _near_duplicate(self, key, shingles, band_keys):
+        """Id of a remembered line this one is a misread copy of, or None"""
+        candidates = set()
+        for band_key in band_keys:
+            candidates.update(self._buckets.get(band_key, ()))
+        for entry_id in candidates:
+            other_key, other, _, _ = self._entries[entry_id]
+            if len(shingles & other) >= self.threshold * len(shingles | other) and _ocr_variants(key, other_key):
+                return entry_id
+        return None
+
+    def is_duplicate(self, line):
+        """Record line and return whether it repeats a remembered line"""
+        key = normalize_line(line)
+        if not key:
+            return False
+        if is_protected(line):
+            self.stats["protected"] += 1
+            return False
+        if key in self._exact:
+            self._exact[key] = self._block
+            self._exact.move_to_end(key)
+            self.stats["exact_duplicates"] += 1
+            return True
+        self._exact[key] = self._block
+
+        shingles = _shingles(key)
+        band_keys = _band_keys(shingles, tuple(word for word in key.split() if _is_number(word)))
+        match = self._near_duplicate(key, shingles, band_keys)
+        if match is not None:
+            # Keep a recurring line (e.g. a menu bar) remembered while it recurs
+            self._entries[match] = self._entries.pop(match)[:3] + (self._block,)
+            self.stats["near_duplicates"] += 1
+            return True
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (key, shingles, band_keys, self._block)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(entry_id)
+        return False
+
+    def add_block(self, block):
+        """Return block without its repeated lines, or None when nothing new is left"""
+        self._block += 1
+        self._expire()
+        kept = []
+        for line in block.splitlines():
+            if not line.strip():
+                continue
+            self.stats["lines_in"] += 1
+            self.stats["chars_in"] += len(line) + 1
+            if not self.is_duplicate(line):
+                kept.append(line)
+                self.stats["lines_out"] += 1
+                self.stats["chars_out"] += len(line) + 1
+        return "\n".join(kept) if kept else None
+
+def dedup_text(text_data, threshold=TEXT_DEDUP_THRESHOLD, window=TEXT_DEDUP_WINDOW, log_callback=print):
+    """Remove repeated and near-repeated lines from text blocks (frames or lines).
+
+    Returns the remaining blocks and a report with line counts and the LLM
+    tokens saved. Pass one block per page or frame: lines are only compared
+    with the last `window` blocks. window=None compares with the whole text,
+    which also drops content repeated far apart and is not meant for prompts.
+    """
+    deduplicator = TextDeduplicator(threshold, window)
+    blocks = [block for block in map(deduplicator.add_block, text_data) if block is not None]
+    stats = deduplicator.stats
+    tokens_in = count_tokens("\n".join(text_data))
+    tokens_out = count_tokens("\n".join(blocks))
+    report = {
+        "lines_in": stats["lines_in"],
+        "lines_out": stats["lines_out"],
+        "exact_duplicates": stats["exact_duplicates"],
+        "near_duplicates": stats["near_duplicates"],
+        "protected_lines": stats["protected"],
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "tokens_saved": tokens_in - tokens_out,
+        "saved_percent": round(100.0 * (tokens_in - tokens_out) / tokens_in, 1) if tokens_in else 0.0
+    }
+    log_callback(f"Text dedup: {report['lines_in']} -> {report['lines_out']} lines "
+                 f"({report['exact_duplicates']} exact, {report['near_duplicates']} near duplicates), "
+                 f"~{report['tokens_saved']} tokens saved ({report['saved_percent']}%)")
+    return blocks, report
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import tempfile
+from email.utils import formatdate, parsedate_to_datetime
+
+import cv2
+
+# Resized frame variants for the UI, generated on first request and kept on
+# disk. Only a few widths are offered so the cache can't be filled with one
+# variant per pixel size.
+THUMBNAIL_CACHE_DIR = os.getenv("THUMBNAIL_CACHE_DIR", "thumbnail_cache")
+THUMBNAIL_WIDTHS = (160, 320, 640, 1280)
+THUMBNAIL_FORMATS = {
+    "webp": ("image/webp", [cv2.IMWRITE_WEBP_QUALITY, 80]),
+    "jpeg": ("image/jpeg", [cv2.IMWRITE_JPEG_QUALITY, 85]),
+}
+DEFAULT_THUMBNAIL_FORMAT = "webp"
+
+def _extension(fmt):
+    return "jpg" if fmt == "jpeg" else fmt
+
+def file_validators(path, variant=""):
+    """(etag, last_modified) of a file, or of a variant derived from it"""
+    st = os.stat(path)
+    tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    if variant:
+        tag = f"{tag}-{variant}"
+    return f'"{tag}"', formatdate(st.st_mtime, usegmt=True)
+
+def is_not_modified(headers, etag, last_modified):
+    """True when the request's If-None-Match / If-Modified-Since show the client copy is current"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since; weak tags compare equal
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def thumbnail_path(source_path, width, fmt=DEFAULT_THUMBNAIL_FORMAT):
+    """Cache location of a variant; it changes whenever the source file does"""
+    st = os.stat(source_path)
+    key = hashlib.sha1(f"{os.path.abspath(source_path)}:{st.st_mtime_ns}:{st.st_size}".encode("utf-8")).hexdigest()
+    return os.path.join(THUMBNAIL_CACHE_DIR, key[:2], f"{key}-{width}.{_extension(fmt)}")
+
+def get_thumbnail(source_path, width, fmt=DEFAULT_THUMBNAIL_FORMAT):
+    """Return (path, media_type) of source_path resized to width, generating it on first use"""
+    if width not in THUMBNAIL_WIDTHS:
+        raise ValueError(f"Unsupported thumbnail width {width}. Expected one of: "
+                         f"{', '.join(str(w) for w in THUMBNAIL_WIDTHS)}")
+    if fmt not in THUMBNAIL_FORMATS:
+        raise ValueError(f"Unsupported thumbnail format '{fmt}'. Expected one of: {', '.join(THUMBNAIL_FORMATS)}")
+    media_type, params = THUMBNAIL_FORMATS[fmt]
+    path = thumbnail_path(source_path, width, fmt)
+    try:
+        # Mark as recently used for the disk GC's LRU eviction (atime is often not updated)
+        os.utime(path)
+        return path, media_type
+    except FileNotFoundError:
+        pass
+
+    image = cv2.imread(source_path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Not an image: {source_path}")
+    height, source_width = image.shape[:2]
+    if source_width > width:
+        image = cv2.resize(image, (width, max(1, int(round(height * width / float(source_width))))),
+                           interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(f".{_extension(fmt)}", image, params)
+    if not ok:
+        raise ValueError(f"Could not encode {source_path} as {fmt}")
+
+    # Write then rename so a concurrent request never serves a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(encoded.tobytes())
+    os.replace(temp_path, path)
+    return path, media_type
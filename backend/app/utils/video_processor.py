@@ -1,57 +1,494 @@
 import cv2
+import numpy as np
 import os
-import pytesseract
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from PIL import Image
+from app.utils.frame_ring import OCR_SHARED_MEMORY
+from app.utils.ocr_backends import check_ocr_available, get_ocr_backend
+from app.utils.ocr_cache import get_ocr_cache
+from app.utils.ocr_engine import get_ocr_pool, ocr_frame
 
-def extract_frames(video_path, output_folder, frame_rate=1, log_callback=print):
-    """Extract frames from video at specified frame rate"""
-    log_callback(f"Extracting frames from {video_path} to {output_folder}")
-    os.makedirs(output_folder, exist_ok=True)
-    
-    cap = cv2.VideoCapture(video_path)
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    interval = int(fps / frame_rate)
-    
-    frame_count = 0
-    saved_count = 0
-    
+# Frame sampling strategies for extract_frames:
+#   decode - legacy loop, fully decodes every frame and keeps one per interval
+#   grab   - grab() skipped frames (demux only, no pixel conversion), decode kept frames
+#   seek   - jump straight to each sample timestamp (nearest keyframe, then decode forward)
+SAMPLING_MODES = ("decode", "grab", "seek")
+DEFAULT_SAMPLING_MODE = "grab"
+
+# Used when the container reports no usable frame rate
+FALLBACK_FPS = 30.0
+
+def check_sampling_options(frame_rate, start_time=None, end_time=None):
+    """Raise ValueError for a non-positive frame rate or an empty/negative time window"""
+    if not frame_rate or frame_rate <= 0:
+        raise ValueError(f"frame_rate must be positive, got {frame_rate}")
+    if start_time is not None and start_time < 0:
+        raise ValueError(f"start_time must not be negative, got {start_time}")
+    if end_time is not None and end_time <= (start_time or 0):
+        raise ValueError(f"end_time ({end_time}) must be after start_time ({start_time or 0})")
+
+def check_sampling_mode(sampling_mode):
+    if sampling_mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode '{sampling_mode}'. Expected one of: {', '.join(SAMPLING_MODES)}")
+
+def _iter_sampled_frames(cap, fps, sample_period, mode, start_time=0.0, end_time=None):
+    """Yield (timestamp, frame) every sample_period seconds from start_time up to end_time.
+
+    Samples are taken at start_time + k * sample_period; each one uses the
+    first frame at (or within half a frame of) that time, so fractional rates
+    work and a video with fewer frames than samples yields each frame once.
+    """
+    if mode == "seek":
+        # Seeking between two frames would return the same frame twice
+        sample_period = max(sample_period, 1.0 / fps)
+        sample = 0
+        while True:
+            timestamp = start_time + sample * sample_period
+            if end_time is not None and timestamp > end_time:
+                break
+            cap.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000.0)
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield timestamp, frame
+            sample += 1
+        return
+
+    frame_index = 0
+    if start_time:
+        # Skip straight to the window instead of decoding everything before it
+        frame_index = int(round(start_time * fps))
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    half_frame = 0.5 / fps
+    sample = 0
     while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
+        timestamp = frame_index / fps
+        if end_time is not None and timestamp > end_time + half_frame:
             break
-            
-        if frame_count % interval == 0:
-            frame_path = os.path.join(output_folder, f"frame_{saved_count}.jpg")
-            cv2.imwrite(frame_path, frame)
-            log_callback(f"Saved frame {saved_count} to {frame_path}")
-            saved_count += 1
-            
-        frame_count += 1
-        
-    cap.release()
+        due = timestamp + half_frame >= start_time + sample * sample_period
+        if mode == "grab" and not due:
+            # Skipped frame: advance the stream without converting it to BGR
+            if not cap.grab():
+                break
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if due:
+                yield timestamp, frame
+                while start_time + sample * sample_period <= timestamp + half_frame:
+                    sample += 1
+        frame_index += 1
+
+# Scene-change detection defaults. Frames are compared as small grayscale
+# thumbnails; a pixel counts as changed when it differs by more than
+# SCENE_PIXEL_DELTA, and a frame is a new scene when the changed fraction
+# exceeds the threshold (a moving cursor alone stays well below it).
+SCENE_DETECTION_WIDTH = 160
+SCENE_PIXEL_DELTA = 24
+DEFAULT_SCENE_THRESHOLD = 0.005
+DEFAULT_MIN_SCENE_GAP = 0.5
+
+class SceneChangeDetector:
+    """Emit a frame only when the screen differs enough from the last emitted frame"""
+
+    def __init__(self, threshold=DEFAULT_SCENE_THRESHOLD, min_gap=DEFAULT_MIN_SCENE_GAP, max_gap=None):
+        self.threshold = threshold
+        self.min_gap = min_gap or 0.0
+        self.max_gap = max_gap
+        self.last_signature = None
+        self.last_timestamp = None
+
+    def _signature(self, frame):
+        height, width = frame.shape[:2]
+        scaled_height = max(1, int(height * SCENE_DETECTION_WIDTH / width))
+        small = cv2.resize(frame, (SCENE_DETECTION_WIDTH, scaled_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def changed_fraction(self, signature):
+        """Fraction of thumbnail pixels that changed since the last emitted frame"""
+        if self.last_signature is None or self.last_signature.shape != signature.shape:
+            return 1.0
+        return float(np.count_nonzero(np.abs(signature - self.last_signature) > SCENE_PIXEL_DELTA)) / signature.size
+
+    def should_emit(self, frame, timestamp):
+        """Return True if the frame at timestamp (seconds) should be kept"""
+        signature = self._signature(frame)
+        if self.last_timestamp is None:
+            emit = True
+        else:
+            gap = timestamp - self.last_timestamp
+            if self.max_gap is not None and gap >= self.max_gap:
+                emit = True
+            elif gap < self.min_gap:
+                emit = False
+            else:
+                emit = self.changed_fraction(signature) >= self.threshold
+
+        if emit:
+            self.last_signature = signature
+            self.last_timestamp = timestamp
+        return emit
+
+# OCR preprocessing. Each sampled frame is shrunk (never enlarged) to the OCR
+# width, converted to grayscale and optionally binarized once, in the decoder
+# process, before it is stored or queued. Tesseract works on grayscale anyway,
+# so this cuts the bytes per frame by 3x or more and the work per OCR call.
+DEFAULT_OCR_MAX_WIDTH = None  # keep the decoded resolution
+# Frames saved for the UI are scaled down further than the OCR input
+UI_FRAME_MAX_WIDTH = int(os.getenv("UI_FRAME_MAX_WIDTH", "1280"))
+
+def _shrink(frame, max_width):
+    height, width = frame.shape[:2]
+    if not max_width or width <= max_width:
+        return frame
+    scaled_height = max(1, int(round(height * max_width / float(width))))
+    return cv2.resize(frame, (max_width, scaled_height), interpolation=cv2.INTER_AREA)
+
+class OCRPreprocessor:
+    """Resize, grayscale and binarize frames for OCR, vectorized with OpenCV"""
+
+    def __init__(self, max_width=DEFAULT_OCR_MAX_WIDTH, grayscale=True, binarize=False):
+        if max_width is not None and max_width < 64:
+            raise ValueError(f"OCR max width must be at least 64 pixels, got {max_width}")
+        self.max_width = max_width
+        self.grayscale = grayscale or binarize
+        self.binarize = binarize
+
+    @property
+    def key(self):
+        """Short name of the settings, part of the OCR cache variant"""
+        return "-".join([f"w{self.max_width or 'full'}", "gray" if self.grayscale else "color"]
+                        + (["bin"] if self.binarize else []))
+
+    def resize(self, frame):
+        return _shrink(frame, self.max_width)
+
+    def convert(self, frame):
+        """Colour conversion and binarization of an already resized frame"""
+        if self.grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.binarize:
+            _, frame = cv2.threshold(frame, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+            if cv2.countNonZero(frame) < frame.size // 2:
+                frame = cv2.bitwise_not(frame)  # dark theme: Tesseract wants dark text on light
+        return frame
+
+    def __call__(self, frame):
+        return self.convert(self.resize(frame))
+
+# OCR profiles. "full" OCRs the whole frame with Tesseract's automatic page
+# segmentation (the original behaviour). The region profiles first find text
+# lines, rescale each to a line height Tesseract reads well, stack them into
+# one compact image and OCR that as a uniform block, which skips the large
+# empty areas of a screen recording.
+OCR_PROFILES = {
+    "full": {"detect_regions": False, "psm": None},
+    "fast": {"detect_regions": True, "psm": 6, "line_height": 24},
+    "accurate": {"detect_regions": True, "psm": 4, "line_height": 36},
+}
+DEFAULT_OCR_PROFILE = "full"
+
+REGION_MIN_HEIGHT = 8
+REGION_MAX_HEIGHT = 160
+REGION_PADDING = 4
+COLLAGE_MARGIN = 10
+
+def detect_text_regions(gray):
+    """Find text line bounding boxes (x, y, w, h) in a grayscale frame, in reading order"""
+    # Text is high-contrast edges: morphological gradient, Otsu threshold,
+    # then a wide closing joins the characters of a line into one blob
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (15, 3))
+    connected = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, line_kernel)
+    contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if not REGION_MIN_HEIGHT <= h <= REGION_MAX_HEIGHT or w < REGION_MIN_HEIGHT:
+            continue
+        # Require a reasonable share of edge pixels so solid boxes and lines are dropped
+        fill = cv2.countNonZero(binary[y:y + h, x:x + w]) / float(w * h)
+        if fill < 0.1:
+            continue
+        regions.append((x, y, w, h))
+
+    regions.sort(key=lambda r: (r[1], r[0]))
+    return regions
+
+def group_regions_into_rows(regions):
+    """Group regions whose vertical centres line up into rows, each sorted left to right"""
+    rows = []
+    for region in sorted(regions, key=lambda r: r[1] + r[3] / 2.0):
+        center = region[1] + region[3] / 2.0
+        if rows:
+            x, y, w, h = rows[-1][0]
+            if abs(center - (y + h / 2.0)) <= h / 2.0:
+                rows[-1].append(region)
+                continue
+        rows.append([region])
+    return [sorted(row, key=lambda r: r[0]) for row in rows]
+
+def build_region_collage(gray, regions, line_height):
+    """Lay the text regions out row by row, rescaled to line_height, as one dark-on-light image"""
+    frame_height, frame_width = gray.shape[:2]
+    strips = []
+    for row in group_regions_into_rows(regions):
+        crops = []
+        for x, y, w, h in row:
+            x0, y0 = max(0, x - REGION_PADDING), max(0, y - REGION_PADDING)
+            x1, y1 = min(frame_width, x + w + REGION_PADDING), min(frame_height, y + h + REGION_PADDING)
+            crop = gray[y0:y1, x0:x1]
+            scale = min(4.0, max(0.5, line_height / float(h)))
+            interpolation = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=interpolation)
+            if crop.mean() < 128:
+                crop = 255 - crop  # light text on a dark bar
+            crops.append(crop)
+
+        # Keep a row on one line so "Click ..." stays next to what it refers to
+        strip_height = max(crop.shape[0] for crop in crops)
+        strip_width = sum(crop.shape[1] for crop in crops) + COLLAGE_MARGIN * 2 * (len(crops) - 1)
+        strip = np.full((strip_height, strip_width), 255, dtype=np.uint8)
+        left = 0
+        for crop in crops:
+            top = (strip_height - crop.shape[0]) // 2
+            strip[top:top + crop.shape[0], left:left + crop.shape[1]] = crop
+            left += crop.shape[1] + COLLAGE_MARGIN * 2
+        strips.append(strip)
+
+    if not strips:
+        return None
+    width = max(strip.shape[1] for strip in strips) + 2 * COLLAGE_MARGIN
+    height = sum(strip.shape[0] + COLLAGE_MARGIN for strip in strips) + COLLAGE_MARGIN
+    collage = np.full((height, width), 255, dtype=np.uint8)
+    top = COLLAGE_MARGIN
+    for strip in strips:
+        collage[top:top + strip.shape[0], COLLAGE_MARGIN:COLLAGE_MARGIN + strip.shape[1]] = strip
+        top += strip.shape[0] + COLLAGE_MARGIN
+    return collage
+
+def ocr_frame_with_profile(frame, profile=DEFAULT_OCR_PROFILE):
+    """OCR a decoded frame using one of OCR_PROFILES (executed inside a worker process)"""
+    settings = OCR_PROFILES[profile]
+    if not settings["detect_regions"]:
+        return ocr_frame(frame)
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    collage = build_region_collage(gray, detect_text_regions(gray), settings["line_height"])
+    if collage is None:
+        return ""
+    return get_ocr_backend().image_to_string(Image.fromarray(collage), psm=settings["psm"])
+
+def ocr_image_file_with_profile(image_path, profile=DEFAULT_OCR_PROFILE):
+    """OCR a frame image file using one of OCR_PROFILES (executed inside a worker process)"""
+    return ocr_frame_with_profile(cv2.imread(image_path), profile)
+
+def iter_frames(video_path, frame_rate=1, log_callback=print, sampling_mode=DEFAULT_SAMPLING_MODE,
+                scene_threshold=None, min_scene_gap=DEFAULT_MIN_SCENE_GAP, max_scene_gap=None,
+                start_time=None, end_time=None):
+    """Decode a video and yield the sampled frames as NumPy arrays, in order.
+
+    frame_rate is in frames per second and may be fractional (1/3 is one
+    frame every 3 seconds). Only the part between start_time and end_time
+    (seconds) is decoded. When scene_threshold is set the sampled frames are additionally
+    filtered by SceneChangeDetector, so only frames showing a new screen are yielded.
+    """
+    check_sampling_mode(sampling_mode)
+    check_sampling_options(frame_rate, start_time, end_time)
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if not fps or fps != fps or fps <= 0:  # 0 or NaN for some containers
+        log_callback(f"Video reports no frame rate, assuming {FALLBACK_FPS} fps")
+        fps = FALLBACK_FPS
+    start_time = start_time or 0.0
+    if start_time or end_time is not None:
+        log_callback(f"Sampling {frame_rate:g} frames/s from {start_time:g}s to "
+                     f"{f'{end_time:g}s' if end_time is not None else 'the end'}")
+
+    emitted_count = 0
+    skipped_count = 0
+    detector = None
+    if scene_threshold is not None:
+        detector = SceneChangeDetector(scene_threshold, min_scene_gap, max_scene_gap)
+        log_callback(f"Scene-change detection enabled (threshold={scene_threshold}, "
+                     f"min gap={min_scene_gap}s, max gap={max_scene_gap if max_scene_gap is not None else 'none'})")
+
+    try:
+        for timestamp, frame in _iter_sampled_frames(cap, fps, 1.0 / frame_rate, sampling_mode,
+                                                     start_time, end_time):
+            if detector and not detector.should_emit(frame, timestamp):
+                skipped_count += 1
+                continue
+            yield frame
+            emitted_count += 1
+    finally:
+        cap.release()
+
+    if detector:
+        log_callback(f"Skipped {skipped_count} unchanged frames")
+    log_callback(f"Decoded {emitted_count} frames")
+
+def extract_frames(video_path, output_folder, frame_rate=1, log_callback=print, sampling_mode=DEFAULT_SAMPLING_MODE,
+                   scene_threshold=None, min_scene_gap=DEFAULT_MIN_SCENE_GAP, max_scene_gap=None,
+                   start_time=None, end_time=None):
+    """Extract frames from video at specified frame rate and write them as JPEGs"""
+    log_callback(f"Extracting frames from {video_path} to {output_folder} (sampling mode: {sampling_mode})")
+    os.makedirs(output_folder, exist_ok=True)
+
+    saved_count = 0
+    for frame in iter_frames(video_path, frame_rate, log_callback, sampling_mode,
+                             scene_threshold, min_scene_gap, max_scene_gap, start_time, end_time):
+        frame_path = os.path.join(output_folder, f"frame_{saved_count}.jpg")
+        cv2.imwrite(frame_path, frame)
+        log_callback(f"Saved frame {saved_count} to {frame_path}")
+        saved_count += 1
+
     log_callback(f"Extracted {saved_count} frames")
     return saved_count
 
-def extract_text_from_frames(frame_folder, log_callback=print):
-    """Extract text from frames using Tesseract OCR"""
-    # Verify Tesseract is properly configured
+class FrameWriter:
+    """Write frames to disk as JPEGs on a background thread so decoding and OCR never wait on disk"""
+
+    def __init__(self, output_folder, max_width=UI_FRAME_MAX_WIDTH):
+        self.output_folder = output_folder
+        self.max_width = max_width
+        os.makedirs(output_folder, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-writer")
+        self._futures = []
+
+    def submit(self, index, frame):
+        """Queue a frame for writing and return the path it will be written to"""
+        frame_path = os.path.join(self.output_folder, f"frame_{index}.jpg")
+        frame = _shrink(frame, self.max_width)
+        self._futures.append(self._executor.submit(cv2.imwrite, frame_path, frame))
+        return frame_path
+
+    def close(self):
+        """Wait for pending writes and surface the first failure, if any"""
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+def check_ocr_profile(ocr_profile):
+    if ocr_profile not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile '{ocr_profile}'. Expected one of: {', '.join(OCR_PROFILES)}")
+
+def process_video(video_path, frames_folder=None, frame_rate=1, log_callback=print,
+                  sampling_mode=DEFAULT_SAMPLING_MODE, scene_threshold=None,
+                  min_scene_gap=DEFAULT_MIN_SCENE_GAP, max_scene_gap=None, workers=None,
+                  ocr_profile=DEFAULT_OCR_PROFILE, progress_callback=None, start_time=None, end_time=None,
+                  ocr_max_width=DEFAULT_OCR_MAX_WIDTH, ocr_grayscale=True, ocr_binarize=False):
+    """Decode a video and OCR its frames in memory, without a JPEG round-trip.
+
+    Decoded frames stream straight into the OCR pool (through shared memory
+    unless OCR_SHARED_MEMORY is off). When frames_folder is given, each frame
+    is also written there for the UI by a background writer, at most
+    UI_FRAME_MAX_WIDTH wide. Frames are preprocessed for OCR by
+    OCRPreprocessor(ocr_max_width, ocr_grayscale, ocr_binarize) first.
+    progress_callback, if given, receives frames_decoded / frames_ocrd counts.
+    Returns (text_blocks, frame_paths), both in frame order.
+    """
     try:
-        pytesseract.get_tesseract_version()
+        check_ocr_available()
     except Exception as e:
         log_callback(f"Tesseract not properly configured: {str(e)}")
         raise Exception("Tesseract OCR is not properly configured. Please verify installation.")
 
-    log_callback(f"Extracting text from frames in {frame_folder}")
+    check_ocr_profile(ocr_profile)
+    preprocessor = OCRPreprocessor(ocr_max_width, ocr_grayscale, ocr_binarize)
+    log_callback(f"Processing video {video_path} (sampling mode: {sampling_mode}, OCR profile: {ocr_profile}, "
+                 f"preprocessing: {preprocessor.key})")
+    pool = get_ocr_pool(workers)
+    cache = get_ocr_cache()
+    writer = FrameWriter(frames_folder) if frames_folder else None
+    frame_paths = []
+
+    def frames():
+        for index, frame in enumerate(iter_frames(video_path, frame_rate, log_callback, sampling_mode,
+                                                  scene_threshold, min_scene_gap, max_scene_gap,
+                                                  start_time, end_time)):
+            # Shrink once; the full-size decoded frame is dropped right here
+            frame = preprocessor.resize(frame)
+            if writer:
+                frame_paths.append(writer.submit(index, frame))
+            if progress_callback:
+                progress_callback(frames_decoded=index + 1)
+            yield preprocessor.convert(frame)
+
     extracted_text = []
-    
-    for file in sorted(os.listdir(frame_folder)):
-        if file.endswith((".jpg", ".png")):
-            image_path = os.path.join(frame_folder, file)
-            log_callback(f"Processing image: {image_path}")
-            text = pytesseract.image_to_string(Image.open(image_path))
+    frame_count = 0
+    start = time.perf_counter()
+    try:
+        for frame_count, text in enumerate(pool.imap(partial(ocr_frame_with_profile, profile=ocr_profile), frames(),
+                                                         cache=cache,
+                                                         cache_variant=f"{ocr_profile}-{preprocessor.key}",
+                                                         shared_memory=OCR_SHARED_MEMORY), 1):
+            if progress_callback:
+                progress_callback(frames_ocrd=frame_count)
             if text.strip():
-                log_callback(f"Extracted text: {text.strip()}")
+                log_callback(f"Extracted text from frame {frame_count - 1}: {text.strip()}")
                 extracted_text.append(text.strip())
+    finally:
+        if writer:
+            writer.close()
+
+    stats = pool.throughput(frame_count, time.perf_counter() - start)
+    log_callback(f"OCR throughput: {stats['frames_per_second']} frames/s "
+                 f"({stats['frames_per_second_per_worker']} frames/s per worker, {stats['workers']} workers)")
+    if cache:
+        cache_stats = cache.stats()
+        log_callback(f"OCR cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses so far "
+                     f"(~{cache_stats['estimated_ocr_seconds_saved']}s of OCR saved)")
+    log_callback(f"Total extracted text blocks: {len(extracted_text)}")
+    return extracted_text, frame_paths
+
+def _frame_sort_key(file_name):
+    """Sort frame_<n>.jpg files numerically so frame_10 comes after frame_9"""
+    digits = "".join(ch for ch in file_name if ch.isdigit())
+    return (int(digits) if digits else -1, file_name)
+
+def extract_text_from_frames(frame_folder, log_callback=print, workers=None, ocr_profile=DEFAULT_OCR_PROFILE):
+    """Extract text from frames using Tesseract OCR in a pool of worker processes"""
+    # Verify Tesseract is properly configured
+    try:
+        check_ocr_available()
+    except Exception as e:
+        log_callback(f"Tesseract not properly configured: {str(e)}")
+        raise Exception("Tesseract OCR is not properly configured. Please verify installation.")
+
+    check_ocr_profile(ocr_profile)
+    log_callback(f"Extracting text from frames in {frame_folder} (OCR profile: {ocr_profile})")
+    extracted_text = []
+    
+    image_paths = [
+        os.path.join(frame_folder, file)
+        for file in sorted(os.listdir(frame_folder), key=_frame_sort_key)
+        if file.endswith((".jpg", ".png"))
+    ]
+    pool = get_ocr_pool(workers)
+    log_callback(f"Running OCR on {len(image_paths)} images with {pool.workers} workers")
+    cache = get_ocr_cache()
+    texts, stats = pool.ocr_files(image_paths, cache=cache, func=partial(ocr_image_file_with_profile, profile=ocr_profile),
+                                  cache_variant=ocr_profile)
+
+    for image_path, text in zip(image_paths, texts):
+        log_callback(f"Processed image: {image_path}")
+        if text.strip():
+            log_callback(f"Extracted text: {text.strip()}")
+            extracted_text.append(text.strip())
     
+    log_callback(f"OCR throughput: {stats['frames_per_second']} frames/s "
+                 f"({stats['frames_per_second_per_worker']} frames/s per worker, {stats['workers']} workers)")
     log_callback(f"Total extracted text blocks: {len(extracted_text)}")
     return extracted_text 
\ No newline at end of file
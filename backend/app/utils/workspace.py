@@ -0,0 +1,46 @@
+import json
+import os
+import shutil
+import tempfile
+
+# Every job writes its outputs (frames, state) into its own directory, so
+# concurrent jobs never share a folder, whichever thread or uvicorn worker
+# runs them. Uploaded files themselves are content-addressed and read-only.
+# Workspaces unused for WORKSPACE_RETENTION_HOURS are removed by the disk GC.
+WORKSPACES_FOLDER = os.getenv("WORKSPACES_FOLDER", "workspaces")
+WORKSPACE_RETENTION_HOURS = float(os.getenv("WORKSPACE_RETENTION_HOURS", "24"))
+JOB_STATE_FILE = "job.json"
+
+def workspace_path(job_id):
+    return os.path.join(WORKSPACES_FOLDER, os.path.basename(job_id))
+
+def create_workspace(job_id):
+    """Create the workspace directory of a job and return its path"""
+    path = workspace_path(job_id)
+    os.makedirs(os.path.join(path, "frames"), exist_ok=True)
+    return path
+
+def touch_workspace(path):
+    """Mark a workspace as recently used so retention and GC keep it longer"""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+def write_job_state(path, state):
+    """Atomically write a job's state into its workspace"""
+    fd, temp_path = tempfile.mkstemp(dir=path, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(temp_path, os.path.join(path, JOB_STATE_FILE))
+
+def read_job_state(job_id):
+    """Job state persisted by whichever process ran the job, or None"""
+    try:
+        with open(os.path.join(workspace_path(job_id), JOB_STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def remove_workspace(path):
+    shutil.rmtree(path, ignore_errors=True)
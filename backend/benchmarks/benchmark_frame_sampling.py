@@ -0,0 +1,70 @@
+"""Compare wall time and CPU time of the extract_frames sampling modes.
+
+Usage:
+    python benchmarks/benchmark_frame_sampling.py [video_path] [--frame-rate 1] [--repeat 3]
+
+Without a video path a synthetic 60 fps screen-recording-like clip is generated.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.video_processor import extract_frames, SAMPLING_MODES
+
+def make_synthetic_video(path, seconds=60, fps=60, width=1280, height=720):
+    """Write a video that changes screen content every few seconds"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(seconds * fps):
+        frame = np.full((height, width, 3), 245, dtype=np.uint8)
+        screen = i // (fps * 3)
+        cv2.rectangle(frame, (0, 0), (width, 60), (90, 60, 30), -1)
+        cv2.putText(frame, f"Screen {screen}", (20, 42), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2)
+        cv2.putText(frame, f"Click the Save button ({screen})", (80, 200 + (screen % 5) * 60),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (30, 30, 30), 2)
+        # Moving cursor so consecutive frames are not identical
+        cv2.circle(frame, (i * 7 % width, 400), 8, (0, 0, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+def run_mode(video_path, mode, frame_rate):
+    with tempfile.TemporaryDirectory() as output_folder:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        count = extract_frames(video_path, output_folder, frame_rate=frame_rate,
+                               log_callback=lambda message: None, sampling_mode=mode)
+        return count, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video_path", nargs="?")
+    parser.add_argument("--frame-rate", type=float, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = args.video_path
+        if not video_path:
+            video_path = os.path.join(tmp, "synthetic.mp4")
+            print("Generating synthetic 60s @ 60fps video...")
+            make_synthetic_video(video_path)
+
+        print(f"{'mode':<8} {'frames':>7} {'wall (s)':>10} {'cpu (s)':>10} {'speedup':>8}")
+        baseline = None
+        for mode in SAMPLING_MODES:
+            runs = [run_mode(video_path, mode, args.frame_rate) for _ in range(args.repeat)]
+            count = runs[0][0]
+            wall = min(run[1] for run in runs)
+            cpu = min(run[2] for run in runs)
+            if baseline is None:
+                baseline = wall
+            print(f"{mode:<8} {count:>7} {wall:>10.3f} {cpu:>10.3f} {baseline / wall:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
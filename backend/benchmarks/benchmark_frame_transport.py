@@ -0,0 +1,66 @@
+"""Compare passing decoded frames to the OCR workers by pickling vs. through shared memory.
+
+Usage:
+    python benchmarks/benchmark_frame_transport.py [--frames 300] [--workers 4] [--width 1920 --height 1080]
+
+The worker only computes a checksum, so the numbers show the cost of moving
+frames between processes, not of OCR.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.frame_ring import FrameRing
+from app.utils.ocr_engine import OCRWorkerPool
+
+def checksum(frame):
+    return int(frame[::64, ::64].sum())
+
+def frames(count, width, height):
+    frame = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for index in range(count):
+        frame[0, 0, 0] = index % 255
+        yield frame
+
+def run(pool, count, width, height, shared_memory):
+    start = time.perf_counter()
+    results = list(pool.imap(checksum, frames(count, width, height), shared_memory=shared_memory))
+    assert len(results) == count
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    pool = OCRWorkerPool(args.workers)
+    sample = next(frames(1, args.width, args.height))
+    ring = FrameRing(1, sample.nbytes)
+    _, ref = ring.write(sample)
+    ring.close()
+    window = args.workers * 2
+    print(f"{args.frames} frames at {args.width}x{args.height}, {args.workers} workers")
+    print(f"{'transport':<14} {'frames/s':>10} {'bytes/frame over pipe':>22} {'frame buffers':>14}")
+    try:
+        run(pool, window, args.width, args.height, False)  # start the worker processes
+        for name, shared_memory, message_size in (("pickle", False, len(pickle.dumps(sample))),
+                                                  ("shared memory", True, len(pickle.dumps(ref)))):
+            fps = run(pool, args.frames, args.width, args.height, shared_memory)
+            # Pickled frames are copied into the pipe, then into each worker;
+            # the ring holds exactly `window` slots however many frames there are
+            buffers = f"{window} slots" if shared_memory else "per frame"
+            print(f"{name:<14} {fps:>10.1f} {message_size:>22} {buffers:>14}")
+    finally:
+        pool.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare blocking and pooled async LLM calls made from async code.
+
+Usage:
+    python benchmarks/benchmark_llm_concurrency.py [--requests 10 50] [--rounds 3] [--keys 4] [--latency 0.5]
+
+A local mock of the chat completions API (run in its own thread) answers
+every request after --latency seconds. Each mode runs --requests completions
+concurrently, as that many simultaneous route calls would, --rounds times.
+Requests are spread over --keys API keys, as from different users:
+
+  blocking   openai.ChatCompletion.create inside async functions (the old routes)
+  async      openai.ChatCompletion.acreate with a new HTTP session per call
+  pooled     app.utils.llm_client: per-key clients over the shared keep-alive session
+
+"connections" is the number of TCP connections the mock server accepted;
+the pool reuses the first round's connections in later rounds. "wrong key"
+counts requests the server received with another request's key; it must be 0.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+from aiohttp import web
+
+from app.utils.llm_client import LLMClientCache, LLMConnectionPool
+
+MESSAGES = [{"role": "user", "content": "Write a test step"}]
+
+class MockServer:
+    """Chat completions endpoint answering after a fixed delay, counting connections"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.connections = set()
+        self.port = None
+        self._ready = threading.Event()
+
+    async def _complete(self, request):
+        self.connections.add(request.transport.get_extra_info("peername"))
+        # Answer with the key the request was made with
+        key = request.headers.get("Authorization", "").replace("Bearer ", "")
+        await asyncio.sleep(self.latency)
+        return web.json_response({
+            "id": "chatcmpl-mock", "object": "chat.completion", "created": 0, "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": key}}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 10, "total_tokens": 15},
+        })
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._complete)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+async def blocking_call(api_key, clients):
+    return openai.ChatCompletion.create(model="gpt-3.5-turbo", messages=MESSAGES, api_key=api_key)
+
+async def async_call(api_key, clients):
+    return await openai.ChatCompletion.acreate(model="gpt-3.5-turbo", messages=MESSAGES, api_key=api_key)
+
+async def pooled_call(api_key, clients):
+    return await clients.get(api_key).chat_completion(MESSAGES, "gpt-3.5-turbo")
+
+async def run(call, requests, rounds, keys, clients):
+    """Seconds taken and the number of answers made with the wrong key"""
+    api_keys = [f"sk-benchmark-{index % keys}" for index in range(requests)]
+    wrong = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        responses = await asyncio.gather(*(call(api_key, clients) for api_key in api_keys))
+        wrong += sum(response.choices[0].message["content"] != api_key
+                     for response, api_key in zip(responses, api_keys))
+    return time.perf_counter() - start, wrong
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--keys", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds the mock API takes per completion")
+    args = parser.parse_args()
+
+    server = MockServer(args.latency)
+    server.start()
+    openai.api_base = f"http://127.0.0.1:{server.port}/v1"
+
+    print(f"{'requests':>9} {'mode':<9} {'seconds':>8} {'req/s':>8} {'connections':>12} {'wrong key':>10}")
+    for requests in args.requests:
+        for mode, call in (("blocking", blocking_call), ("async", async_call), ("pooled", pooled_call)):
+            pool = LLMConnectionPool()
+            clients = LLMClientCache(pool=pool)
+            server.connections.clear()
+
+            async def measure():
+                result = await run(call, requests, args.rounds, args.keys, clients)
+                await pool.close()
+                return result
+
+            seconds, wrong = asyncio.run(measure())
+            print(f"{requests:>9} {mode:<9} {seconds:>8.2f} {requests * args.rounds / seconds:>8.1f} "
+                  f"{len(server.connections):>12} {wrong:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure per-image OCR time of each available OCR backend on 1080p screen captures.
+
+Usage:
+    python benchmarks/benchmark_ocr_backends.py [image ...] [--count 20]
+
+Without image paths, synthetic 1920x1080 application screens are generated.
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.ocr_backends import PytesseractBackend, TesserocrBackend, TESSEROCR_AVAILABLE
+
+def make_screen(index, width=1920, height=1080):
+    """Render a screen that looks roughly like a web application"""
+    frame = np.full((height, width, 3), 250, dtype=np.uint8)
+    cv2.rectangle(frame, (0, 0), (width, 70), (90, 60, 30), -1)
+    cv2.putText(frame, f"Orders - Workspace {index}", (30, 48), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2)
+    cv2.rectangle(frame, (0, 70), (300, height), (235, 235, 235), -1)
+    for row, item in enumerate(["Dashboard", "Orders", "Customers", "Reports", "Settings"]):
+        cv2.putText(frame, item, (30, 140 + row * 60), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (40, 40, 40), 2)
+    for row in range(8):
+        cv2.putText(frame, f"Order #{1000 + index * 10 + row}   Pending   Click to review",
+                    (360, 160 + row * 70), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (20, 20, 20), 2)
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+def benchmark(backend_factory, images):
+    start = time.perf_counter()
+    backend = backend_factory()
+    backend.image_to_string(images[0])
+    first_call = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for image in images:
+        backend.image_to_string(image)
+    per_image = (time.perf_counter() - start) / len(images)
+    return first_call, per_image
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--count", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.images:
+        images = [Image.open(path).convert("RGB") for path in args.images]
+    else:
+        images = [make_screen(i) for i in range(args.count)]
+
+    backends = [("pytesseract", PytesseractBackend)]
+    if TESSEROCR_AVAILABLE:
+        backends.append(("tesserocr", TesserocrBackend))
+    else:
+        print("tesserocr is not installed; only the pytesseract backend will be measured")
+
+    print(f"{'backend':<12} {'first call (ms)':>16} {'per image (ms)':>15} {'saving':>8}")
+    baseline = None
+    for name, factory in backends:
+        first_call, per_image = benchmark(factory, images)
+        if baseline is None:
+            baseline = per_image
+        saving = (baseline - per_image) / baseline * 100 if baseline else 0.0
+        print(f"{name:<12} {first_call * 1000:>16.1f} {per_image * 1000:>15.1f} {saving:>7.1f}%")
+
+if __name__ == "__main__":
+    main()
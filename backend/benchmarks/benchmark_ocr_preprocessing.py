@@ -0,0 +1,50 @@
+"""Compare OCR preprocessing settings (target width, grayscale, binarize) on speed, size and text recall.
+
+Usage:
+    python benchmarks/benchmark_ocr_preprocessing.py [--count 10] [--profile full]
+
+Frames are the synthetic 1080p screens of benchmark_text_regions.py.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.video_processor import OCR_PROFILES, OCRPreprocessor, ocr_frame_with_profile
+from benchmark_text_regions import make_frame, recall
+
+SETTINGS = [
+    {"max_width": None, "grayscale": False},
+    {"max_width": None, "grayscale": True},
+    {"max_width": 1600, "grayscale": True},
+    {"max_width": 1280, "grayscale": True},
+    {"max_width": 1280, "grayscale": True, "binarize": True},
+    {"max_width": 960, "grayscale": True},
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--profile", choices=list(OCR_PROFILES), default="full")
+    args = parser.parse_args()
+
+    frames = [make_frame(seed, 1920, 1080) for seed in range(args.count)]
+    print(f"{args.count} frames at 1920x1080, OCR profile {args.profile}")
+    print(f"{'preprocessing':<18} {'KB/frame':>9} {'prep ms':>8} {'OCR ms':>8} {'recall':>8}")
+    for settings in SETTINGS:
+        preprocessor = OCRPreprocessor(**settings)
+        start = time.perf_counter()
+        prepared = [preprocessor(frame) for frame, _ in frames]
+        prep_time = (time.perf_counter() - start) / len(frames)
+        ocr_frame_with_profile(prepared[0], args.profile)  # warm up the engine
+        start = time.perf_counter()
+        texts = [ocr_frame_with_profile(frame, args.profile) for frame in prepared]
+        ocr_time = (time.perf_counter() - start) / len(frames)
+        score = sum(recall(words, text) for (_, words), text in zip(frames, texts)) / len(frames)
+        print(f"{preprocessor.key:<18} {prepared[0].nbytes / 1024:>9.0f} {prep_time * 1000:>8.1f} "
+              f"{ocr_time * 1000:>8.1f} {score:>7.1%}")
+
+if __name__ == "__main__":
+    main()
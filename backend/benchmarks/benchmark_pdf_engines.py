@@ -0,0 +1,96 @@
+"""Compare PDF engines on text extraction and page rendering speed and on peak memory.
+
+Usage:
+    python benchmarks/benchmark_pdf_engines.py [--pages 20 100 300] [--render-pages 10] [--dpi 200]
+
+A corpus of synthetic Scribe-like PDFs (a few lines of step text and a
+screenshot per page) is generated with PyMuPDF. Every measurement runs in a
+fresh process, so peak memory (max RSS growth during the run) is not
+inflated by earlier runs.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.pdf_engines import PDF_ENGINES, available_pdf_engines, get_pdf_engine
+
+def make_pdf(path, pages):
+    """Write a PDF with step text and a 1280x720 screenshot on every page"""
+    import fitz
+    rng = np.random.default_rng(0)
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 60), f"Step {page_number + 1}", fontsize=16)
+        for line in range(6):
+            page.insert_text((72, 90 + line * 16), f"Click \"Button {page_number}-{line}\" in the Orders view",
+                             fontsize=11)
+        screenshot = np.full((720, 1280, 3), 245, dtype=np.uint8)
+        screenshot[:60] = (40, 60, 90)
+        screenshot[100:700:40, 320:1200] = rng.integers(0, 120, (15, 880, 3), dtype=np.uint8)
+        pixmap = fitz.Pixmap(fitz.csRGB, 1280, 720, screenshot.tobytes(), False)
+        page.insert_image(fitz.Rect(72, 200, 540, 463), pixmap=pixmap)
+    doc.save(path)
+
+def _peak_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def measure(engine_name, pdf_path, render_pages, dpi):
+    """Runs in a fresh process: text and render throughput plus peak memory growth"""
+    engine = get_pdf_engine(engine_name)
+    baseline = _peak_kb()
+    result = {}
+    start = time.perf_counter()
+    texts = engine.page_texts(pdf_path)
+    result["text_pages_per_second"] = len(texts) / (time.perf_counter() - start)
+    try:
+        start = time.perf_counter()
+        for page_number in range(min(render_pages, len(texts))):
+            engine.render_page(pdf_path, page_number, dpi)
+        result["render_pages_per_second"] = min(render_pages, len(texts)) / (time.perf_counter() - start)
+    except Exception as e:
+        result["render_error"] = f"{type(e).__name__}"
+    result["peak_mb"] = (_peak_kb() - baseline) / 1024.0
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--render-pages", type=int, default=10)
+    parser.add_argument("--dpi", type=int, default=200)
+    args = parser.parse_args()
+
+    engines = available_pdf_engines()
+    missing = [name for name in PDF_ENGINES if name not in engines]
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+    context = multiprocessing.get_context("spawn")
+    render_errors = {}
+    with tempfile.TemporaryDirectory() as corpus:
+        print(f"{'pages':>6} {'engine':<11} {'text pages/s':>13} {'render pages/s':>15} {'peak MB':>8}")
+        for pages in args.pages:
+            pdf_path = os.path.join(corpus, f"scribe_{pages}.pdf")
+            make_pdf(pdf_path, pages)
+            for engine_name in engines:
+                with context.Pool(1) as pool:
+                    result = pool.apply(measure, (engine_name, pdf_path, args.render_pages, args.dpi))
+                if "render_pages_per_second" in result:
+                    render = f"{result['render_pages_per_second']:.1f}"
+                else:
+                    render = "n/a"
+                    render_errors[engine_name] = result["render_error"]
+                print(f"{pages:>6} {engine_name:<11} {result['text_pages_per_second']:>13.1f} "
+                      f"{render:>15} {result['peak_mb']:>8.1f}")
+    for engine_name, error in render_errors.items():
+        print(f"{engine_name} could not render pages: {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Compare the Scribe step parser with the implementation it replaced.
+
+Usage:
+    python benchmarks/benchmark_scribe_parser.py [--lines 1000 10000 50000] [--scenarios 5] [--repeat 3]
+
+Documents are synthetic OCR dumps: several Scribe guides (title, step
+numbers, action lines, expected outcomes) mixed with screen text. The legacy
+parser prints every line; its output goes to /dev/null here, so the figures
+include formatting the output but not a terminal. It also only ever finds
+the first scenario, so the step counts differ by design.
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.scribe_parser import ScribeParser
+
+ACTIONS = ["Click \"Save\"", "Type \"Invoice 42\"", "Navigate to https://example.com/orders", "Select \"Shipped\"",
+           "Check \"Send copy\"", "Press Enter", "Scroll down", "Upload report.pdf", "Double-click \"Row 3\""]
+NOISE = ["Orders", "Customer Details", "Filter by status", "Pending", "12:04 PM", "Export", "Account Settings",
+         "Invoice total 1,200.00", "Search...", "Dashboard"]
+
+def make_document(lines, scenarios, seed=0):
+    """Return about `lines` lines holding `scenarios` guides with screen text between steps"""
+    rng = random.Random(seed)
+    per_scenario = max(1, lines // scenarios)
+    text = []
+    for scenario in range(scenarios):
+        text += [f"How to process order batch {scenario + 1}", "Made with Scribe"]
+        number = 1
+        while len(text) < per_scenario * (scenario + 1):
+            text += [str(number), rng.choice(ACTIONS)]
+            if rng.random() < 0.3:
+                text.append(f"Expected Outcome: Step {number} is saved")
+            text += rng.sample(NOISE, 3)
+            number += 1
+    return text
+
+def legacy_generate_test_cases(text_data):
+    """Frozen copy of the parser that app.utils.scribe_parser replaced"""
+    print("Received text data:")
+    for line in text_data:
+        print(f"  {line}")
+
+    if not text_data:
+        print("Warning: Received empty text data")
+        return []
+
+    test_cases = []
+    current_scenario = None
+    current_step = None
+
+    for line in text_data:
+        if line.strip() and not line.startswith("Made with Scribe") and "Click" in line:
+            title_index = text_data.index(line) - 1
+            while title_index >= 0:
+                potential_title = text_data[title_index].strip()
+                if potential_title and not potential_title.startswith("Made with") and not potential_title.isdigit():
+                    current_scenario = {
+                        "name": potential_title,
+                        "steps": []
+                    }
+                    print(f"Found scenario: {potential_title}")
+                    break
+                title_index -= 1
+            break
+
+    if not current_scenario:
+        print("No scenario name found")
+        return []
+
+    current_step_num = None
+    for line in text_data:
+        line = line.strip()
+        print(f"Processing line: {line}")
+
+        if not line or line.startswith("Made with Scribe"):
+            continue
+
+        if line.isdigit():
+            current_step_num = int(line)
+            continue
+
+        if line and not line.isdigit() and ("Click" in line or "Navigate" in line):
+            print(f"Found step {current_step_num}: {line}")
+            if current_step:
+                current_scenario["steps"].append(current_step)
+
+            current_step = {
+                "description": line,
+                "expected_outcome": "Action completed successfully"
+            }
+
+        elif line.startswith("Expected Outcome:"):
+            print(f"Found expected outcome: {line}")
+            if current_step:
+                current_step["expected_outcome"] = line.replace("Expected Outcome:", "").strip()
+
+    if current_step and current_scenario:
+        current_scenario["steps"].append(current_step)
+
+    test_cases.append(current_scenario)
+    print(f"Final scenario name: {current_scenario['name']}")
+    print(f"Number of steps found: {len(current_scenario['steps'])}")
+    for idx, step in enumerate(current_scenario['steps'], 1):
+        print(f"Step {idx}: {step['description']}")
+    print(f"Generated test cases: {test_cases}")
+    return test_cases
+
+def best_of(repeat, func, *args):
+    """Fastest of `repeat` runs: (seconds, result)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def run_legacy(text):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return legacy_generate_test_cases(text)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--scenarios", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scribe_parser = ScribeParser()
+    print(f"{'lines':>7} {'parser':<7} {'ms':>9} {'lines/s':>11} {'scenarios':>10} {'steps':>7} "
+          f"{'first scenario ms':>18}")
+    for lines in args.lines:
+        text = make_document(lines, args.scenarios)
+        legacy_seconds, legacy = best_of(args.repeat, run_legacy, text)
+        new_seconds, parsed = best_of(args.repeat, lambda: list(scribe_parser.iter_test_cases(text)))
+        # Time until the generator hands out the first complete scenario
+        first_seconds, _ = best_of(args.repeat, lambda: next(scribe_parser.iter_test_cases(text)))
+        for name, seconds, result, first in (("legacy", legacy_seconds, legacy, None),
+                                             ("new", new_seconds, parsed, first_seconds)):
+            steps = sum(len(test_case["steps"]) for test_case in result)
+            first = f"{first * 1000:.2f}" if first is not None else "-"
+            print(f"{len(text):>7} {name:<7} {seconds * 1000:>9.2f} {len(text) / seconds:>11.0f} "
+                  f"{len(result):>10} {steps:>7} {first:>18}")
+
+if __name__ == "__main__":
+    main()
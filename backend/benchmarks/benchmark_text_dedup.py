@@ -0,0 +1,68 @@
+"""Measure OCR text de-duplication: lines and LLM tokens removed, speed, and lost content.
+
+Usage:
+    python benchmarks/benchmark_text_dedup.py [--frames 500 3000] [--steps 40] [--noise 0.02]
+
+Frames are synthetic OCR output of a screen recording: a menu bar and a
+status line on every frame, the current step shown for a run of frames,
+with OCR-like character confusions (l/1, O/0, rn/m, ...). Step lines are
+always kept, so the savings come from the menu bar and status line. "lost"
+counts distinct step texts that no longer appear in any form, which must be 0.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.text_dedup import dedup_text, normalize_line
+
+CONFUSIONS = {"l": "1", "o": "0", "O": "0", "e": "c", "i": "l", "S": "5", "m": "rn", "B": "8"}
+TARGETS = ["order", "customer", "invoice", "shipping", "payment", "report", "user", "account", "profile",
+           "billing", "refund", "supplier"]
+
+def misread(line, rng, noise):
+    return "".join(CONFUSIONS.get(char, char) if rng.random() < noise else char for char in line)
+
+def make_frames(frames, steps, noise, seed=0):
+    """Return (frames, step texts) for a recording of `steps` steps"""
+    rng = random.Random(seed)
+    step_texts = [f"Click the {rng.choice(['Submit', 'Save', 'Next'])} button on the {TARGETS[i % len(TARGETS)]} "
+                  f"form for batch {i // len(TARGETS) + 1}" for i in range(steps)]
+    text = []
+    for index in range(frames):
+        step = step_texts[index * steps // frames]
+        text.append("\n".join([
+            misread("Home   Orders   Customers   Reports   Settings", rng, noise),
+            misread(step, rng, noise),
+            misread(f"Signed in as jane.doe@example.com | {index // 30 % 60:02d}:{index % 30:02d}", rng, noise),
+        ]))
+    return text, step_texts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, nargs="+", default=[500, 3000])
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--noise", type=float, default=0.02, help="chance of a misread per character")
+    args = parser.parse_args()
+
+    print(f"{'frames':>7} {'mode':<9} {'lines in':>9} {'lines out':>10} {'tokens in':>10} {'saved':>8} "
+          f"{'ms':>8} {'lost':>5}")
+    for frames in args.frames:
+        text, step_texts = make_frames(frames, args.steps, args.noise)
+        for mode, window in (("window 10", 10), ("window 50", 50)):
+            start = time.perf_counter()
+            blocks, report = dedup_text(text, window=window, log_callback=lambda message: None)
+            elapsed = time.perf_counter() - start
+            # A step is lost when not even a misread copy of it survived
+            kept = {normalize_line(line) for block in blocks for line in block.splitlines()}
+            lost = sum(1 for step in step_texts
+                       if not any(key.endswith(normalize_line(step).split()[-1]) and
+                                  normalize_line(step).split()[-3] in key for key in kept))
+            print(f"{frames:>7} {mode:<9} {report['lines_in']:>9} {report['lines_out']:>10} "
+                  f"{report['tokens_in']:>10} {report['saved_percent']:>7.1f}% {elapsed * 1000:>8.1f} {lost:>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare OCR profiles (full frame vs. text-region detection) on speed and text recall.
+
+Usage:
+    python benchmarks/benchmark_text_regions.py [--count 10] [--width 1920 --height 1080]
+
+Frames are synthetic application screens with known text, so recall is the
+share of the rendered words that appear in the OCR output.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.video_processor import OCR_PROFILES, ocr_frame_with_profile
+
+WORDS = ["Click", "Save", "Orders", "Customer", "Invoice", "Submit", "Cancel", "Navigate", "Settings",
+         "Report", "Export", "Search", "Filter", "Approve", "Pending", "Shipped", "Details", "Account"]
+
+def make_frame(seed, width, height):
+    """Render a screen with a header bar, a sidebar and rows of text. Returns (frame, words)"""
+    rng = random.Random(seed)
+    scale = width / 1920.0
+    frame = np.full((height, width, 3), 250, dtype=np.uint8)
+    words = []
+
+    def text(line, x, y, size, color):
+        cv2.putText(frame, line, (int(x * scale), int(y * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                    size * scale, color, max(1, int(2 * scale)))
+        words.extend(line.split())
+
+    cv2.rectangle(frame, (0, 0), (width, int(70 * scale)), (90, 60, 30), -1)
+    text(f"{rng.choice(WORDS)} {rng.choice(WORDS)}", 30, 48, 1.2, (255, 255, 255))
+    for row in range(5):
+        text(rng.choice(WORDS), 30, 140 + row * 60, 0.9, (40, 40, 40))
+    for row in range(rng.randint(4, 10)):
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+        text(line, 360, 160 + row * 80, rng.choice([0.7, 0.9, 1.1]), (20, 20, 20))
+    return frame, words
+
+def recall(expected_words, text):
+    found = Counter(re.findall(r"[A-Za-z]+", text.lower()))
+    expected = Counter(word.lower() for word in expected_words)
+    hits = sum(min(count, found[word]) for word, count in expected.items())
+    return hits / float(sum(expected.values()))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    frames = [make_frame(seed, args.width, args.height) for seed in range(args.count)]
+    print(f"{args.count} frames at {args.width}x{args.height}")
+    print(f"{'profile':<10} {'ms/frame':>10} {'recall':>8}")
+    for profile in OCR_PROFILES:
+        ocr_frame_with_profile(frames[0][0], profile)  # warm up the engine
+        start = time.perf_counter()
+        recalls = [recall(words, ocr_frame_with_profile(frame, profile)) for frame, words in frames]
+        per_frame = (time.perf_counter() - start) / len(frames)
+        print(f"{profile:<10} {per_frame * 1000:>10.1f} {sum(recalls) / len(recalls):>7.1%}")
+
+if __name__ == "__main__":
+    main()